@@ -32,166 +32,278 @@ Next steps I can implement (if you want):
 
 """
 from typing import List, Tuple, Dict
+import functools
 import numpy as np
 import random
 from collections import defaultdict
-from Monopoly.board import tiles
+from Monopoly.board import tiles, BOARD_CHANCE, BOARD_CC, GO_TO_JAIL_IDX, JAIL_IDX
+
+# Numba is optional: when present, repeated per-game matrix construction
+# drops to compiled-loop speed; otherwise the NumPy scatter path is used.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # --- Dice distribution ---
 
+# Two-dice sum distribution as constant arrays, computed once at import so
+# the matrix builder can broadcast over them instead of iterating a dict.
+DICE_SUMS = np.arange(2, 13)
+DICE_PROBS = np.array([1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]) / 36.0
+
+
 def dice_distribution():
     """Return probability distribution for two 6-sided dice sums (2..12).
     Returns a dict sum -> probability."""
-    dist = defaultdict(int)
-    for d1 in range(1, 7):
-        for d2 in range(1, 7):
-            dist[d1 + d2] += 1
-    total = 36
-    return {s: cnt / total for s, cnt in dist.items()}
+    return dict(zip(DICE_SUMS.tolist(), DICE_PROBS.tolist()))
+
+
+def _fill_P(P, N, go_to_jail_idx, jail_idx, chance_mask, cc_mask,
+            dice_sums, dice_probs, chance_jail_prob, cc_jail_prob):
+    """Scatter the dice-move probability mass into P in-place.
+
+    Plain arrays only (indices use -1 for "no such tile") so the body is
+    Numba-compilable; decorated below when numba is available.
+    """
+    for i in range(N):
+        for k in range(dice_sums.shape[0]):
+            j = (i + dice_sums[k]) % N
+            prob = dice_probs[k]
+            if jail_idx >= 0 and j == go_to_jail_idx:
+                P[i, jail_idx] += prob
+                continue
+            if chance_mask[j]:
+                if jail_idx >= 0:
+                    P[i, jail_idx] += prob * chance_jail_prob
+                    P[i, j] += prob * (1 - chance_jail_prob)
+                else:
+                    P[i, j] += prob
+            elif cc_mask[j]:
+                if jail_idx >= 0:
+                    P[i, jail_idx] += prob * cc_jail_prob
+                    P[i, j] += prob * (1 - cc_jail_prob)
+                else:
+                    P[i, j] += prob
+            else:
+                P[i, j] += prob
+
+
+if njit is not None:
+    _fill_P = njit(cache=True)(_fill_P)
 
 
 # --- Markov chain for landing probabilities ---
 class MarkovChain:
-    def __init__(self, board: List, chance_jail_prob: float = 1/6, cc_jail_prob: float = 1/6):
+    def __init__(self, board: List, chance_jail_prob: float = 1/6, cc_jail_prob: float = 1/6,
+                 use_codegen: bool = False, use_sparse: bool = False):
         self.board = board
         self.N = len(board)
         self.chance_jail_prob = chance_jail_prob
         self.cc_jail_prob = cc_jail_prob
-        self.go_to_jail_idx = self.board.index("Go To Jail") if "Go To Jail" in self.board else None
-        # Jail index (tile "Jail")
-        self.jail_idx = None
-        for i, t in enumerate(self.board):
-            if t == "Jail":
-                self.jail_idx = i
-                break
         self.dice_dist = dice_distribution()
+        # Boolean tile-type masks so the matrix builder can work on whole
+        # rows at once instead of string-comparing per cell. For the
+        # canonical board these are import-time constants from board.py.
+        if board is tiles:
+            self.go_to_jail_idx = GO_TO_JAIL_IDX
+            self.jail_idx = JAIL_IDX
+            self.chance_mask = BOARD_CHANCE
+            self.cc_mask = BOARD_CC
+        else:
+            self.go_to_jail_idx = self.board.index("Go To Jail") if "Go To Jail" in self.board else None
+            self.jail_idx = self.board.index("Jail") if "Jail" in self.board else None
+            self.chance_mask = np.array([t == "Chance" for t in self.board])
+            self.cc_mask = np.array([t == "Community Chest" for t in self.board])
+        # Opt-in partial evaluation: the board is constant, so the whole
+        # dice-move scatter can be specialized to straight-line code once.
+        self._fill_P_gen = self._compile_fill() if use_codegen else None
         self.P = self._build_transition_matrix()
-
-    def _is_chance(self, idx):
-        return self.board[idx] == "Chance"
-
-    def _is_community(self, idx):
-        return self.board[idx] == "Community Chest"
+        if use_sparse:
+            # Opt-in float32 CSR storage: only ~30% of each row is nonzero,
+            # and the sparse API scales cleanly to larger house-rule boards.
+            from scipy import sparse
+            self.P = sparse.csr_matrix(self.P.astype(np.float32))
+
+    def _compile_fill(self):
+        """Generate a branch-free fill function specialized to this board.
+
+        Every (source, destination, probability) contribution is resolved at
+        construction time — jail redirects and chance/CC splits included — and
+        emitted as a flat sequence of `P[i, j] += c` statements that is
+        compiled and exec'd once. Calling the result is ~440 plain stores
+        with no per-cell dispatch, mod arithmetic, or branching.
+        """
+        contrib = defaultdict(float)
+        jidx = self.jail_idx
+        gtj = self.go_to_jail_idx
+        for i in range(self.N):
+            for roll_sum, prob in self.dice_dist.items():
+                j = (i + roll_sum) % self.N
+                if jidx is not None and j == gtj:
+                    contrib[(i, jidx)] += prob
+                elif self.chance_mask[j] and jidx is not None:
+                    contrib[(i, jidx)] += prob * self.chance_jail_prob
+                    contrib[(i, j)] += prob * (1 - self.chance_jail_prob)
+                elif self.cc_mask[j] and jidx is not None:
+                    contrib[(i, jidx)] += prob * self.cc_jail_prob
+                    contrib[(i, j)] += prob * (1 - self.cc_jail_prob)
+                else:
+                    contrib[(i, j)] += prob
+        lines = ["def _fill(P):"]
+        lines.extend(f"    P[{i}, {j}] += {c!r}" for (i, j), c in contrib.items())
+        namespace = {}
+        exec(compile("\n".join(lines), "<markov-fill>", "exec"), namespace)
+        return namespace["_fill"]
 
     def _build_transition_matrix(self):
         N = self.N
         P = np.zeros((N, N))
+        jidx = self.jail_idx
+        gtj = self.go_to_jail_idx
+        rows = np.arange(N)
+
+        if self._fill_P_gen is not None:
+            # Board-specialized straight-line fill generated in __init__.
+            self._fill_P_gen(P)
+        elif njit is not None:
+            # Compiled kernel: the branchy per-cell logic runs at C speed.
+            _fill_P(P, N, -1 if gtj is None else gtj,
+                    -1 if jidx is None else jidx,
+                    self.chance_mask, self.cc_mask, DICE_SUMS, DICE_PROBS,
+                    self.chance_jail_prob, self.cc_jail_prob)
+        else:
+            # Branchless single pass: the full (N, 11) destination matrix is
+            # built by broadcasting, jail redirects and chance/CC splits are
+            # resolved with masks/where, and everything is scattered at once.
+            dest = (rows[:, None] + DICE_SUMS[None, :]) % N
+
+            # Landing on "Go To Jail" means moving to jail
+            if gtj is not None and jidx is not None:
+                dest = np.where(dest == gtj, jidx, dest)
+
+            # Chance and Community Chest are simplified: ~chance_jail_prob to go to jail
+            jail_frac = (self.chance_mask[dest] * self.chance_jail_prob
+                         + self.cc_mask[dest] * self.cc_jail_prob)
+            probs = np.broadcast_to(DICE_PROBS, dest.shape)
+            src = np.broadcast_to(rows[:, None], dest.shape)
+            if jidx is not None:
+                P[:, jidx] += (probs * jail_frac).sum(axis=1)
+                np.add.at(P, (src, dest), probs * (1.0 - jail_frac))
+            else:
+                np.add.at(P, (src, dest), probs)
 
-        for i in range(N):
-            # If "Go To Jail" landing, move to jail deterministically
-            if i == self.go_to_jail_idx:
-                if self.jail_idx is not None:
-                    P[i, self.jail_idx] = 1.0
-                else:
-                    P[i, i] = 1.0
-                continue
-
-            # For each dice outcome, compute landing square and apply Chance/CC effects
-            for roll_sum, prob in self.dice_dist.items():
-                j = (i + roll_sum) % N
-
-                # If this landing square is Go To Jail, move to jail
-                if j == self.go_to_jail_idx and self.jail_idx is not None:
-                    P[i, self.jail_idx] += prob
-                    continue
-
-                # Chance and Community Chest are simplified: ~chance_jail_prob to go to jail
-                if self._is_chance(j):
-                    if self.jail_idx is not None:
-                        P[i, self.jail_idx] += prob * self.chance_jail_prob
-                    P[i, j] += prob * (1 - self.chance_jail_prob)
-                    continue
-
-                if self._is_community(j):
-                    if self.jail_idx is not None:
-                        P[i, self.jail_idx] += prob * self.cc_jail_prob
-                    P[i, j] += prob * (1 - self.cc_jail_prob)
-                    continue
-
-                # Normal landing
-                P[i, j] += prob
-
-        # Simplified jail handling: when on jail tile, assume 1/6 chance to leave (roll doubles)
-        # and (5/6) to remain. When leaving, distribute according to dice distribution.
-        if self.jail_idx is not None:
-            jidx = self.jail_idx
-            P[jidx, :] = 0.0
+        # Simplified jail handling: when on jail tile, assume 1/6 chance to leave
+        # (roll doubles) and 5/6 to remain. Leaving reuses the normal-move row
+        # computed above, scaled by the leave probability.
+        if jidx is not None:
             leave_prob = 1 / 6.0
-            stay_prob = 1 - leave_prob
-            P[jidx, jidx] = stay_prob
-            for roll_sum, prob in self.dice_dist.items():
-                dest = (jidx + roll_sum) % N
-                # applying same Chance/CC/go-to-jail logic as above for dest
-                if dest == self.go_to_jail_idx and self.jail_idx is not None:
-                    P[jidx, self.jail_idx] += leave_prob * prob
-                elif self._is_chance(dest):
-                    if self.jail_idx is not None:
-                        P[jidx, self.jail_idx] += leave_prob * prob * self.chance_jail_prob
-                    P[jidx, dest] += leave_prob * prob * (1 - self.chance_jail_prob)
-                elif self._is_community(dest):
-                    if self.jail_idx is not None:
-                        P[jidx, self.jail_idx] += leave_prob * prob * self.cc_jail_prob
-                    P[jidx, dest] += leave_prob * prob * (1 - self.cc_jail_prob)
-                else:
-                    P[jidx, dest] += leave_prob * prob
+            jail_row = P[jidx].copy()
+            P[jidx, :] = leave_prob * jail_row
+            P[jidx, jidx] += 1 - leave_prob
+
+        # If "Go To Jail" landing, move to jail deterministically
+        if gtj is not None:
+            P[gtj, :] = 0.0
+            P[gtj, jidx if jidx is not None else gtj] = 1.0
 
         # Sanity: rows should sum to 1
         row_sums = P.sum(axis=1)
-        for r in range(N):
-            if row_sums[r] == 0:
-                P[r, r] = 1.0
-            else:
-                P[r, :] /= row_sums[r]
+        empty = row_sums == 0
+        if empty.any():
+            P[empty, empty.nonzero()[0]] = 1.0
+            row_sums[empty] = 1.0
+        P /= row_sums[:, None]
 
         return P
 
     def stationary_distribution(self, tol=1e-12, max_iter=10000):
-        """Compute stationary distribution via power iteration on P^T.
+        """Compute stationary distribution by solving (P^T - I)pi = 0 directly.
+
+        The singular system is closed with the normalization sum(pi) = 1 by
+        replacing the last row with ones, so a single np.linalg.solve (one LU
+        factorization) replaces thousands of power-iteration matvecs. Falls
+        back to squared power iteration if the solve fails.
         Returns a vector length N summing to 1."""
         N = self.N
+        if not isinstance(self.P, np.ndarray):
+            # Sparse CSR path: same closed system, solved sparsely.
+            from scipy import sparse
+            from scipy.sparse import linalg as splinalg
+            A = (self.P.T - sparse.eye(N, dtype=self.P.dtype, format="csr")).tolil()
+            A[-1, :] = 1.0
+            b = np.zeros(N)
+            b[-1] = 1.0
+            return splinalg.spsolve(A.tocsr(), b)
+        try:
+            A = self.P.T - np.eye(N)
+            A[-1, :] = 1.0
+            b = np.zeros(N)
+            b[-1] = 1.0
+            return np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:
+            pass
+        # Fallback: power iteration on (P^T)^2. Squaring halves the iteration
+        # count needed to damp the slow-mixing second eigenvalue around the
+        # jail square; convergence is only checked every 10 steps so the norm
+        # cost is amortized over the cheap matvecs.
         pi = np.ones(N) / N
-        PT = self.P.T
-        for _ in range(max_iter):
-            new_pi = PT.dot(pi)
-            if np.linalg.norm(new_pi - pi, ord=1) < tol:
+        PT2 = self.P.T @ self.P.T
+        for it in range(max_iter):
+            new_pi = PT2.dot(pi)
+            if it % 10 == 0 and np.linalg.norm(new_pi - pi, ord=1) < tol:
                 return new_pi
             pi = new_pi
         return pi
 
 
+# --- Cached chain factory ---
+# The board is static, so the transition matrix and stationary distribution
+# only need to be computed once per board object. lru_cache can't hash a
+# list, so we key on id(board) and keep the board itself in a registry.
+_BOARD_REGISTRY = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _chain_for(board_id):
+    chain = MarkovChain(_BOARD_REGISTRY[board_id])
+    chain.stationary = chain.stationary_distribution()
+    return chain
+
+
+def get_chain(board):
+    """Return a memoized MarkovChain (with .stationary precomputed) for `board`."""
+    _BOARD_REGISTRY.setdefault(id(board), board)
+    return _chain_for(id(board))
+
+
+# tile object id -> board index, keyed by board id (boards are static).
+_TILE_IDX_CACHE = {}
+
+
 # --- Building recommendation helpers ---
 
 def expected_rent_increase(prop, landing_prob, owner=None):
     """Compute expected rent increase for adding one house (or hotel conversion)
-    using the property's rent table and a landing probability.
+    by reading the rent table directly — no temporary mutation of the property
+    to replay calculate_rent, which was thread-unsafe and defeated batching.
 
     Returns (delta_expected_income, will_be_hotel_boolean)
     """
-    # current rent
-    owns_full = False
-    if owner:
-        owns_full = owner._owns_full_colour_set(prop.colour)
-    current_rent = prop.calculate_rent(owns_full_colour_set=owns_full, roll_dice=7) if prop.colour == "Utility" else prop.calculate_rent(owns_full_colour_set=owns_full)
-
-    # determine post-build rent
-    if prop.hotel:
+    # Utilities/Stations aren't buildable; hotels can't be improved further
+    if not prop.buildable or prop.hotel or not prop.rent_levels:
         return 0.0, False
+
+    owns_full = owner._owns_full_colour_set(prop.colour) if owner else False
+    # base rent doubles on a completed set only while unimproved
+    mult = 2 if (owns_full and prop.houses == 0) else 1
+    current_rent = prop.rent_levels[prop.houses] * mult
+
     if prop.houses < 4:
-        # rent after adding one house
-        # temporarily simulate
-        orig_houses = prop.houses
-        prop.houses += 1
-        new_rent = prop.calculate_rent(owns_full_colour_set=owns_full)
-        prop.houses = orig_houses
+        new_rent = prop.rent_levels[prop.houses + 1]
         return (landing_prob * (new_rent - current_rent)), False
     elif prop.houses == 4 and prop.can_build_hotel():
-        # hotel conversion
-        orig_houses = prop.houses
-        prop.houses = 0
-        prop.hotel = True
-        new_rent = prop.calculate_rent(owns_full_colour_set=owns_full)
-        prop.houses = orig_houses
-        prop.hotel = False
+        new_rent = prop.rent_levels[5]
         return (landing_prob * (new_rent - current_rent)), True
     return 0.0, False
 
@@ -212,21 +324,50 @@ def top_build_recommendations(player, landing_probs: np.ndarray, max_builds: int
     if not colour_sets:
         return []
 
-    candidate_actions = []
+    # Board positions never change, so look indices up in an id-keyed map
+    # cached per board instead of an O(N) list.index scan per property.
+    # (Player uses __slots__, so the cache lives here, not on the player.)
+    tile_to_idx = _TILE_IDX_CACHE.get(id(player.board))
+    if tile_to_idx is None:
+        tile_to_idx = {id(t): i for i, t in enumerate(player.board)}
+        _TILE_IDX_CACHE[id(player.board)] = tile_to_idx
+
+    # Gather improvable candidates, then score them all in one NumPy pass
+    # instead of per-property Python arithmetic.
+    candidates = []
     for colour, props in colour_sets.items():
         # even-build rule: always consider properties with the fewest houses first
         props_sorted = sorted(props, key=lambda x: (x.houses if not x.hotel else float('inf')))
-        for prop in props_sorted:
-            idx = player.board.index(prop)
-            prob = float(landing_probs[idx])
-            delta_income, will_hotel = expected_rent_increase(prop, prob, owner=player)
-            candidate_actions.append((prop, delta_income, will_hotel, prop.house_price))
+        candidates.extend(p for p in props_sorted
+                          if p.rent_levels and not p.hotel
+                          and (p.houses < 4 or p.can_build_hotel()))
 
-    # sort by expected income per £ cost (ROI-like)
-    candidate_actions = [c for c in candidate_actions if c[1] > 0]
-    candidate_actions.sort(key=lambda x: (x[1] / (x[3] if x[3] > 0 else 1)), reverse=True)
+    if not candidates:
+        return []
+
+    rows = np.arange(len(candidates))
+    houses = np.array([p.houses for p in candidates])
+    costs = np.array([p.house_price for p in candidates])
+    probs = np.asarray(landing_probs)[[tile_to_idx[id(p)] for p in candidates]]
+    rent_table = np.array([p.rent_levels for p in candidates], dtype=float)
 
-    # Trim to max_builds and affordability given min_reserve
+    # these are all completed sets, so base rent is doubled while unimproved;
+    # houses+1 lands on the hotel rent (index 5) for the 4-house case
+    current_rent = rent_table[rows, houses] * np.where(houses == 0, 2.0, 1.0)
+    new_rent = rent_table[rows, houses + 1]
+    delta_income = probs * (new_rent - current_rent)
+    will_hotel = houses == 4
+
+    # sort by expected income per £ cost (ROI-like)
+    order = np.argsort(-delta_income / np.maximum(costs, 1))
+    candidate_actions = [(candidates[i], float(delta_income[i]), bool(will_hotel[i]), int(costs[i]))
+                         for i in order if delta_income[i] > 0]
+
+    # Trim to max_builds and affordability given min_reserve. House counts
+    # don't change while planning, so the per-set minimum level is computed
+    # once here instead of rescanning the set for every candidate.
+    min_houses = {c: min((p.houses if not p.hotel else 5) for p in props)
+                  for c, props in colour_sets.items()}
     plan = []
     money_available = player.money - min_reserve
     for prop, income, is_hotel, cost in candidate_actions:
@@ -235,9 +376,7 @@ def top_build_recommendations(player, landing_probs: np.ndarray, max_builds: int
         if money_available < cost:
             continue
         # Also check even-build constraint: don't build if it would make houses uneven by >1
-        set_props = [p for p in player.properties if p.colour == prop.colour]
-        min_houses = min((p.houses if not p.hotel else 5) for p in set_props)
-        if (prop.houses if not prop.hotel else 5) > min_houses + 1:
+        if (prop.houses if not prop.hotel else 5) > min_houses[prop.colour] + 1:
             continue
         plan.append((prop, income, is_hotel, cost))
         money_available -= cost
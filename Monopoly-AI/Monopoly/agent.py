@@ -1,13 +1,51 @@
 # Monopoly/agent.py
+import os
 import random
 import math
 import pickle
 from collections import defaultdict, Counter
 from typing import List, Dict, Any, Optional, Tuple
 
+import numpy as np
+
+from Monopoly.Markovchain import get_chain
+
+# Optional numba, same pattern as Markovchain: the empirical rollout scan
+# compiles to a tight loop when available, otherwise runs as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Simple type hints
 Suggestion = Dict[str, Any]
 
+
+def _props_by_colour(game):
+    """Board tiles grouped by colour, built once per game and cached on it."""
+    groups = getattr(game, "_properties_by_colour", None)
+    if groups is None:
+        groups = defaultdict(list)
+        for t in game.board:
+            if hasattr(t, "colour"):
+                groups[t.colour].append(t)
+        game._properties_by_colour = groups
+    return groups
+
+
+def _scan_positions(steps, start_pos, board_len, is_gtj, jail_idx, out):
+    """Sequential position scan over pre-drawn dice sums; numba-compilable."""
+    pos = start_pos
+    for i in range(steps.shape[0]):
+        pos = (pos + steps[i]) % board_len
+        if is_gtj[pos]:
+            pos = jail_idx
+        out[i] = pos
+
+
+if njit is not None:
+    _scan_positions = njit(cache=True)(_scan_positions)
+
 class Agent:
     """Base interface for advisors."""
     def suggest_buy(self, player, property_tile, game) -> Suggestion:
@@ -27,33 +65,47 @@ class Agent:
 # -----------------------
 class MarkovEstimator:
     """
-    Estimate landing probabilities by simulating many dice-only turns.
-    This is a lightweight empirical estimator (ignores full card logic
-    for speed but includes Go-To-Jail).
+    Landing probabilities for the board. The old version simulated
+    n_sim dice-only turns in a Python loop; the exact answer is available
+    analytically from the MarkovChain's stationary distribution, so
+    estimate() now just reads that (memoized per board).
     """
     def __init__(self, board, n_sim=2000):
         self.board = board
-        self.n_sim = n_sim
+        self.n_sim = n_sim  # kept for API compatibility; no longer used
         self.probs = None
 
     def estimate(self, start_pos=0):
-        counts = Counter()
-        pos = start_pos
+        pi = get_chain(self.board).stationary
+        self.probs = {i: float(pi[i]) for i in range(len(self.board))}
+        return self.probs
+
+    def estimate_empirical(self, start_pos=0):
+        """Empirical estimator kept for experiments that want sampling noise.
+        All dice are generated in one vectorized draw and tallied with a
+        single bincount instead of a Counter incremented per roll."""
         n = self.n_sim
-        for _ in range(n):
-            d1 = random.randint(1, 6)
-            d2 = random.randint(1, 6)
-            steps = d1 + d2
-            pos = (pos + steps) % len(self.board)
-            tile = self.board[pos]
-            # simple card effect: if Go To Jail tile, jump to jail
-            if tile == "Go To Jail":
-                pos = 10
-            counts[pos] += 1
-        total = sum(counts.values())
-        self.probs = {i: counts[i] / total for i in range(len(self.board))}
+        board_len = len(self.board)
+        steps = np.random.randint(1, 7, size=(n, 2)).sum(axis=1)
+        is_gtj = getattr(self, '_is_gtj', None)
+        if is_gtj is None:
+            is_gtj = np.array([t == "Go To Jail" for t in self.board])
+            self._is_gtj = is_gtj
+        positions = np.empty(n, dtype=np.int64)
+        _scan_positions(steps, start_pos, board_len, is_gtj, 10, positions)
+        counts = np.bincount(positions, minlength=board_len)
+        self.probs = {i: counts[i] / n for i in range(board_len)}
         return self.probs
 
+    def estimate_horizon(self, k, start_pos=0):
+        """Exact landing distribution after k turns starting from start_pos.
+        One matrix power replaces n_sim*k random rolls."""
+        chain = get_chain(self.board)
+        pi0 = np.zeros(len(self.board))
+        pi0[start_pos] = 1.0
+        pi = pi0 @ np.linalg.matrix_power(chain.P, k)
+        return {i: float(pi[i]) for i in range(len(self.board))}
+
 class MonteCarloEvaluator:
     """
     Perform short Monte Carlo rollouts to estimate delta win-rate or
@@ -98,13 +150,15 @@ class RuleBasedAgent(Agent):
         # Don't exceed player money
         return min(base_bid, player.money)
 
-    def _completes_set_if_bought(self, player, prop, game):
+    def _completes_set_if_bought(self, player, prop, game, owned_counts=None):
         colour = prop.colour
         if colour in ("Station", "Utility"):
             return False
-        all_of_colour = [t for t in game.board if hasattr(t, "colour") and t.colour == colour]
-        owned = sum(1 for p in player.properties if p.colour == colour)
-        return owned == len(all_of_colour) - 1
+        if owned_counts is None:
+            owned = sum(1 for p in player.properties if p.colour == colour)
+        else:
+            owned = owned_counts[colour]
+        return owned == len(_props_by_colour(game)[colour]) - 1
 
     def suggest_buy(self, player, property_tile, game):
         # Always recommend buy if buying completes a set
@@ -120,14 +174,17 @@ class RuleBasedAgent(Agent):
 
     def suggest_trade(self, player, other_players, game):
         proposals = []
-        # Propose cash offers if a trade would complete a set
-        all_props = [t for t in game.board if isinstance(t, type(player.properties[0]))] if player.properties else [t for t in game.board if hasattr(t, "price")]
+        # Propose cash offers if a trade would complete a set. Players keep an
+        # incremental per-colour count; fall back to a scan for bare stubs.
+        owned_counts = getattr(player, "_colour_counts", None)
+        if owned_counts is None:
+            owned_counts = Counter(p.colour for p in player.properties)
         for opp in other_players:
-            if opp == player: 
+            if opp == player:
                 continue
             for prop in list(opp.properties):
                 # if acquiring prop would give a monopoly
-                if self._completes_set_if_bought(player, prop, game):
+                if self._completes_set_if_bought(player, prop, game, owned_counts):
                     offer = int(prop.price * 1.5)
                     if player.money >= max(offer - 200, 0):  # small heuristic allowance
                         proposals.append({
@@ -140,7 +197,7 @@ class RuleBasedAgent(Agent):
         return proposals
 
     def suggest_jail_action(self, player, game):
-        monopolies = sum(1 for c in set(p.colour for p in player.properties) if player._owns_full_colour_set(c))
+        monopolies = len(player.full_colour_sets())
         # Late-game (has monopolies): prefer to stay in jail to avoid landing on opponents
         if monopolies >= 2:
             return {"action": "stay_try_roll", "score": 0.6, "reason": "Has multiple monopolies — safer to avoid moving."}
@@ -149,22 +206,20 @@ class RuleBasedAgent(Agent):
             return {"action": "try_roll", "score": 0.4, "reason": "Preserve money; attempt to roll doubles."}
         # Default: pay to get moving early
         return {"action": "pay", "score": 0.5, "reason": "Early game mobility preferred; pay £50 to get out."}
-    def suggest_bid(self, player, property_tile, game):
-        # Score higher if completes a color set
-        score_multiplier = 1.5 if player._owns_full_colour_set(property_tile.colour) else 1.0
-        base_bid = int(property_tile.price * score_multiplier)
-        # Don't exceed player money
-        return min(base_bid, player.money)
 
     def suggest_build(self, player, candidate_props: List, game):
         # Candidate props is a list of properties in completed sets
         # Heuristic: build on set with highest house_price * expected landings
-        estimator = MarkovEstimator(game.board, n_sim=1500)
-        probs = estimator.estimate()
+        # The board is static, so use the memoized exact stationary distribution
+        # instead of re-simulating 1500 dice turns on every call.
+        probs = get_chain(game.board).stationary
+        tile_idx = getattr(game, "_tile_idx", None)
+        if tile_idx is None:
+            tile_idx = game._tile_idx = {id(t): i for i, t in enumerate(game.board)}
         best = []
         for colour, props in candidate_props.items():
             # expected landing probability for any property in this set ~ sum(probs of those indices)
-            idxs = [game.board.index(p) for p in props]
+            idxs = [tile_idx[id(p)] for p in props]
             p_land = sum(probs[i] for i in idxs)
             # rent delta per house roughly rent_levels[1] - rent_levels[0] (if defined)
             sample = props[0]
@@ -193,6 +248,18 @@ import pickle
 from collections import defaultdict
 from typing import Dict, List
 
+COLOUR_TO_ID = {"Brown": 0, "Light Blue": 1, "Pink": 2, "Orange": 3,
+                "Red": 4, "Yellow": 5, "Green": 6, "Dark Blue": 7,
+                "Station": 8, "Utility": 9}
+
+# state-space dimensions for the flat Q-table encoding
+N_CASH = 4
+N_MONO = 9    # 0..8 monopolies (clamped)
+N_ZONE = 10
+N_COLOUR = len(COLOUR_TO_ID)
+N_PRICE = 4   # house prices 50/100/150/200
+
+
 class QLearningAgent:
     """
     Tabular Q-learning agent for Monopoly:
@@ -200,16 +267,37 @@ class QLearningAgent:
       - Jail action: try_roll / pay / use_card
       - Build: build_cheapest / skip
     State is coarse for tractable Q-tables.
-    Save/Load via pickle.
+
+    Q-tables are dense NumPy arrays indexed by a flat state id rather than
+    dicts-of-dicts: no tuple hashing per lookup, argmax instead of
+    max(q, key=q.get), and save/load via np.savez instead of pickling
+    thousands of tiny dicts.
     """
     def __init__(self, epsilon=0.1, alpha=0.1, gamma=0.99):
-        self.q_buy = defaultdict(lambda: {0: 0.0, 1: 0.0})       # 0: skip, 1: buy
-        self.q_jail = defaultdict(lambda: {0: 0.0, 1: 0.0, 2: 0.0}) # 0: try_roll,1:pay,2:use_card
-        self.q_build = defaultdict(lambda: {0: 0.0, 1: 0.0})      # 0: skip, 1: build_cheapest
+        self.q_buy = np.zeros((N_CASH * N_MONO * N_ZONE * N_COLOUR, 2), dtype=np.float32)   # 0: skip, 1: buy
+        self.q_jail = np.zeros((N_CASH * N_MONO * N_ZONE, 3), dtype=np.float32)             # 0: try_roll,1:pay,2:use_card
+        self.q_build = np.zeros((N_CASH * N_MONO * N_PRICE, 2), dtype=np.float32)           # 0: skip, 1: build_cheapest
         self.epsilon = epsilon
         self.alpha = alpha
         self.gamma = gamma
 
+    # --- Flat state encoding ---
+    def _encode_buy(self, s):
+        cash, mono, zone, colour = s
+        mono = min(mono, N_MONO - 1)
+        return ((cash * N_MONO + mono) * N_ZONE + zone) * N_COLOUR + COLOUR_TO_ID.get(colour, 0)
+
+    def _encode_jail(self, s):
+        cash, mono, zone = s
+        mono = min(mono, N_MONO - 1)
+        return (cash * N_MONO + mono) * N_ZONE + zone
+
+    def _encode_build(self, s):
+        cash, mono, house_price = s
+        mono = min(mono, N_MONO - 1)
+        price_id = min(max(house_price // 50 - 1, 0), N_PRICE - 1)
+        return (cash * N_MONO + mono) * N_PRICE + price_id
+
     # --- State helpers ---
     def _cash_bucket(self, cash):
         if cash < 100: return 0
@@ -218,7 +306,7 @@ class QLearningAgent:
         return 3
 
     def _monopoly_count(self, player):
-        return sum(1 for c in set(p.colour for p in player.properties) if player._owns_full_colour_set(c))
+        return len(player.full_colour_sets())
 
     def _pos_zone(self, player, board_len):
         return player.position * 10 // board_len
@@ -235,31 +323,31 @@ class QLearningAgent:
         return (self._cash_bucket(player.money), self._monopoly_count(player), cheapest_house_price)
 
     def _state_trade(self, player, game):
-        full_sets = sum(1 for colour in ["Brown","Light Blue","Pink","Orange","Red","Yellow","Green","Dark Blue"]
-                        if player._owns_full_colour_set(colour))
+        # street groups only: stations/utilities don't count here
+        full_sets = len(player.full_colour_sets() - {"Station", "Utility"})
         return (player.money, len(player.properties), full_sets)
 
     # --- Action selection ---
     def suggest_buy(self, player, property_tile, game):
-        s = self._state_buy(player, property_tile, game)
-        if random.random() < self.epsilon:
-            a = random.choice([0,1])
+        sid = self._encode_buy(self._state_buy(player, property_tile, game))
+        q = self.q_buy[sid]
+        if np.random.random() < self.epsilon:
+            a = int(np.random.randint(2))
         else:
-            q = self.q_buy[s]
-            a = max(q, key=q.get)
-        reason = "QL policy" if any(self.q_buy[s].values()) else "No Q-data fallback"
-        return {"action": "buy" if a==1 else "skip", "score": float(self.q_buy[s][a]), "reason": reason}
+            a = int(np.argmax(q))
+        reason = "QL policy" if q.any() else "No Q-data fallback"
+        return {"action": "buy" if a==1 else "skip", "score": float(q[a]), "reason": reason}
 
     def suggest_jail_action(self, player, game):
-        s = self._state_jail(player, game)
-        if random.random() < self.epsilon:
-            a = random.choice([0,1,2])
+        sid = self._encode_jail(self._state_jail(player, game))
+        q = self.q_jail[sid]
+        if np.random.random() < self.epsilon:
+            a = int(np.random.randint(3))
         else:
-            q = self.q_jail[s]
-            a = max(q, key=q.get)
+            a = int(np.argmax(q))
         mapping = {0: "try_roll", 1: "pay", 2: "use_card"}
-        reason = "QL policy" if any(self.q_jail[s].values()) else "No Q-data"
-        return {"action": mapping[a], "score": float(self.q_jail[s][a]), "reason": reason}
+        reason = "QL policy" if q.any() else "No Q-data"
+        return {"action": mapping[a], "score": float(q[a]), "reason": reason}
 
     def suggest_trade(self, player, other_players, game):
         from Monopoly.agent import RuleBasedAgent
@@ -269,28 +357,28 @@ class QLearningAgent:
         if not candidate_props:
             return []
         cheapest_price = min([props[0].house_price for props in candidate_props.values()])
-        s = self._state_build(player, cheapest_price, game)
-        if random.random() < self.epsilon:
-            a = random.choice([0,1])
+        sid = self._encode_build(self._state_build(player, cheapest_price, game))
+        q = self.q_build[sid]
+        if np.random.random() < self.epsilon:
+            a = int(np.random.randint(2))
         else:
-            q = self.q_build[s]
-            a = max(q, key=q.get)
-        reason = "QL policy" if any(self.q_build[s].values()) else "No Q-data"
+            a = int(np.argmax(q))
+        reason = "QL policy" if q.any() else "No Q-data"
         if a == 0:
-            return [{"action": "skip", "score": self.q_build[s][0], "reason": reason}]
+            return [{"action": "skip", "score": float(q[0]), "reason": reason}]
         else:
             best_colour = min(candidate_props.keys(), key=lambda k: candidate_props[k][0].house_price)
             return [{"action": "build", "colour": best_colour,
                      "house_price": candidate_props[best_colour][0].house_price,
-                     "score": self.q_build[s][1], "reason": reason}]
+                     "score": float(q[1]), "reason": reason}]
 
     # --- Auction / Bid suggestion ---
     def suggest_bid(self, player, property_tile, game, current_bid):
         base_price = property_tile.price
         cash = player.money
         bid_increment = max(10, int(base_price * 0.05))
-        completes_set = all(p.owner == player for p in game.board
-                            if hasattr(p, 'colour') and p.colour == property_tile.colour)
+        completes_set = all(p.owner == player
+                            for p in _props_by_colour(game)[property_tile.colour])
         max_affordable = cash - 100
         value_factor = base_price * (1.5 if completes_set else 1.0)
         suggested_bid = min(max(current_bid + bid_increment, int(value_factor)), max_affordable)
@@ -308,35 +396,48 @@ class QLearningAgent:
                 reward = 0
 
             if module == "buy":
-                qdict = self.q_buy[s]
+                arr, sid = self.q_buy, self._encode_buy(s)
             elif module == "jail":
-                qdict = self.q_jail[s]
+                arr, sid = self.q_jail, self._encode_jail(s)
             elif module == "build":
-                qdict = self.q_build[s]
+                arr, sid = self.q_build, self._encode_build(s)
             else:
                 continue
 
             update_value = reward if reward is not None else (G if G is not None else 0)
-            qdict[a] += self.alpha * (update_value - qdict[a])
+            arr[sid, a] += self.alpha * (update_value - arr[sid, a])
 
     # --- Save / Load ---
     def save(self, path):
-        with open(path, "wb") as f:
-            pickle.dump({
-                "q_buy": dict(self.q_buy),
-                "q_jail": dict(self.q_jail),
-                "q_build": dict(self.q_build),
-                "epsilon": self.epsilon,
-                "alpha": self.alpha,
-                "gamma": self.gamma
-            }, f)
+        np.savez(path,
+                 q_buy=self.q_buy, q_jail=self.q_jail, q_build=self.q_build,
+                 epsilon=self.epsilon, alpha=self.alpha, gamma=self.gamma)
 
     @classmethod
     def load(cls, path):
-        with open(path, "rb") as f:
-            data = pickle.load(f)
-        obj = cls(epsilon=data.get("epsilon", 0.05), alpha=data.get("alpha", 0.1), gamma=data.get("gamma", 0.99))
-        obj.q_buy = defaultdict(lambda: {0:0.0,1:0.0}, data.get("q_buy", {}))
-        obj.q_jail = defaultdict(lambda: {0:0.0,1:0.0,2:0.0}, data.get("q_jail", {}))
-        obj.q_build = defaultdict(lambda: {0:0.0,1:0.0}, data.get("q_build", {}))
+        # np.savez appends .npz to a bare filename, so accept the same
+        # path the caller gave to save().
+        if not os.path.exists(path) and os.path.exists(path + ".npz"):
+            path = path + ".npz"
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            # Legacy pickle format: dicts keyed by state tuples.
+            with open(path, "rb") as f:
+                legacy = pickle.load(f)
+            obj = cls(epsilon=legacy.get("epsilon", 0.05), alpha=legacy.get("alpha", 0.1),
+                      gamma=legacy.get("gamma", 0.99))
+            for name, encoder in (("q_buy", obj._encode_buy),
+                                  ("q_jail", obj._encode_jail),
+                                  ("q_build", obj._encode_build)):
+                arr = getattr(obj, name)
+                for s, qdict in legacy.get(name, {}).items():
+                    sid = encoder(s)
+                    for a, v in qdict.items():
+                        arr[sid, a] = v
+            return obj
+        obj = cls(epsilon=float(data["epsilon"]), alpha=float(data["alpha"]), gamma=float(data["gamma"]))
+        obj.q_buy = data["q_buy"]
+        obj.q_jail = data["q_jail"]
+        obj.q_build = data["q_build"]
         return obj
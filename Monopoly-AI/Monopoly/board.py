@@ -1,5 +1,7 @@
 # Monopoly/board.py
 
+import numpy as np
+
 from Monopoly.property import Property
 
 tiles = [
@@ -44,3 +46,83 @@ tiles = [
     "Super Tax",
     Property("Mayfair", 400, 50, "Dark Blue", [50, 200, 600, 1400, 1700, 2000])
 ]
+
+# Full-set bitmask per colour: bit i is set when tiles[i] belongs to the
+# colour group. Owning a full set is then a single AND-compare against a
+# player's owned_mask instead of a board scan.
+COLOUR_MASKS = {}
+for _i, _tile in enumerate(tiles):
+    _colour = getattr(_tile, "colour", None)
+    if _colour is not None:
+        COLOUR_MASKS[_colour] = COLOUR_MASKS.get(_colour, 0) | (1 << _i)
+del _i, _tile, _colour
+
+# How many properties make up each colour group (shared table on Property).
+COLOUR_TOTALS = Property.COLOUR_GROUP_SIZE
+assert {c: m.bit_count() for c, m in COLOUR_MASKS.items()} == COLOUR_TOTALS
+
+# Static property indexes: the board never changes, so the colour groups
+# are built once at import instead of isinstance-scanning tiles per call.
+ALL_PROPERTIES = tuple(t for t in tiles if isinstance(t, Property))
+PROPERTIES_BY_COLOUR = {}
+for _p in ALL_PROPERTIES:
+    PROPERTIES_BY_COLOUR.setdefault(_p.colour, []).append(_p)
+PROPERTIES_BY_COLOUR = {c: tuple(g) for c, g in PROPERTIES_BY_COLOUR.items()}
+del _p
+
+# Small-int tile kinds so per-move dispatch is a table lookup instead of
+# an isinstance/string-compare chain.
+KIND_PLAIN, KIND_PROPERTY, KIND_CARD, KIND_GO_TO_JAIL, KIND_INCOME_TAX, KIND_SUPER_TAX = range(6)
+
+
+def tile_kind(tile):
+    """Classify a tile into one of the KIND_* codes."""
+    if isinstance(tile, Property):
+        return KIND_PROPERTY
+    if tile == "Chance" or tile == "Community Chest":
+        return KIND_CARD
+    if tile == "Go To Jail":
+        return KIND_GO_TO_JAIL
+    if tile == "Income Tax":
+        return KIND_INCOME_TAX
+    if tile == "Super Tax":
+        return KIND_SUPER_TAX
+    return KIND_PLAIN
+
+
+TILE_KINDS = tuple(tile_kind(t) for t in tiles)
+
+# Static per-property price columns (aligned with ALL_PROPERTIES) for
+# vectorized valuations; only ownership/build state changes at runtime.
+PROPERTY_PRICES = np.array([p.price for p in ALL_PROPERTIES], dtype=np.float64)
+PROPERTY_HOUSE_PRICES = np.array([p.house_price for p in ALL_PROPERTIES], dtype=np.float64)
+
+# Full-board numeric columns (aligned with tiles, zero/-1 on non-property
+# squares): the structure-of-arrays view of the static board that the
+# bulk simulator's kernels index instead of chasing Property attributes.
+COLOUR_ID = {c: i for i, c in enumerate(Property.COLOUR_GROUP_SIZE)}
+TILE_PRICES = np.zeros(len(tiles), dtype=np.int32)
+TILE_BASE_RENTS = np.zeros(len(tiles), dtype=np.int32)
+TILE_COLOUR_IDS = np.full(len(tiles), -1, dtype=np.int8)
+for _i, _t in enumerate(tiles):
+    if isinstance(_t, Property):
+        TILE_PRICES[_i] = _t.price
+        TILE_BASE_RENTS[_i] = _t.rent_levels[0] if _t.rent_levels else _t.base_rent
+        TILE_COLOUR_IDS[_i] = COLOUR_ID[_t.colour]
+del _i, _t
+GROUP_SIZE_ARR = np.array(
+    [Property.COLOUR_GROUP_SIZE[c] for c in COLOUR_ID], dtype=np.int8)
+# Per-position street-rent table over the 7 rent states
+# (base, doubled base, 1-4 houses, hotel); zero rows on non-streets.
+RENT_LOOKUP = np.zeros((len(tiles), 7), dtype=np.int32)
+for _i, _t in enumerate(tiles):
+    if isinstance(_t, Property) and _t.buildable:
+        RENT_LOOKUP[_i] = _t._rent_state_table
+del _i, _t
+
+# Tile-type lookups computed once at import, so chain builders read
+# constants instead of string-comparing and list-scanning per instance.
+BOARD_CHANCE = np.array([t == "Chance" for t in tiles])
+BOARD_CC = np.array([t == "Community Chest" for t in tiles])
+GO_TO_JAIL_IDX = tiles.index("Go To Jail")
+JAIL_IDX = tiles.index("Jail")
@@ -0,0 +1,139 @@
+# Monopoly/fast_sim.py
+"""
+Bulk Monte Carlo simulator over numeric board columns.
+
+The OO game loop (Player.move / handle_tile) is fine for interactive play
+but spends most of its time in interpreter overhead when thousands of
+self-play games are needed. This module mirrors the numeric core of a
+game — dice movement, passing Go, Go To Jail, taxes, buying unowned
+property, and rent with the full-set doubling — over structure-of-arrays
+state (positions, money, owners, houses per tile), so the whole inner
+loop compiles with numba when it is installed and still runs as plain
+numpy-backed Python when it is not.
+
+Deliberate simplifications (same spirit as the MarkovChain model):
+- players always buy an affordable unowned property;
+- no auctions, trades, mortgages, or building decisions;
+- jail is a teleport (no stay-in-jail turns), cards are ignored.
+
+Use simulate_games() for rollouts; it returns final money per player per
+game, which is what expected-value estimates need.
+"""
+import numpy as np
+
+from Monopoly.board import (tiles, TILE_KINDS, TILE_PRICES, TILE_BASE_RENTS,
+                            TILE_COLOUR_IDS, GROUP_SIZE_ARR, JAIL_IDX)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+N_TILES = len(tiles)
+
+# The static structure-of-arrays board columns live in board.py alongside
+# the other import-time lookups; only per-game state is allocated here.
+KINDS = np.array(TILE_KINDS, dtype=np.int8)
+PRICES = TILE_PRICES
+BASE_RENTS = TILE_BASE_RENTS
+COLOUR_IDS = TILE_COLOUR_IDS
+GROUP_SIZES = GROUP_SIZE_ARR
+N_COLOURS = len(GROUP_SIZES)
+
+
+def _play_game(dice, money, positions, owners, colour_counts,
+               kinds, prices, base_rents, colour_ids, group_sizes,
+               n_turns, jail_idx, n_tiles):
+    """Numeric core of one simulated game; arrays only, numba-compilable.
+
+    dice is a pre-rolled (rolls, 2) int8 array consumed sequentially.
+    Returns the number of dice rows consumed.
+    """
+    n_players = money.shape[0]
+    d = 0
+    for _turn in range(n_turns):
+        for k in range(n_players):
+            if money[k] < 0:
+                continue  # bankrupt players sit out
+            doubles = 0
+            while True:
+                d1 = dice[d, 0]
+                d2 = dice[d, 1]
+                d += 1
+                new_pos = (positions[k] + d1 + d2) % n_tiles
+                if new_pos < positions[k]:
+                    money[k] += 200  # passed Go
+                positions[k] = new_pos
+                kind = kinds[new_pos]
+                if kind == 3:  # KIND_GO_TO_JAIL
+                    positions[k] = jail_idx
+                elif kind == 4:  # KIND_INCOME_TAX
+                    money[k] -= 200
+                elif kind == 5:  # KIND_SUPER_TAX
+                    money[k] -= 100
+                elif kind == 1:  # KIND_PROPERTY
+                    owner = owners[new_pos]
+                    if owner == -1:
+                        if money[k] >= prices[new_pos]:
+                            money[k] -= prices[new_pos]
+                            owners[new_pos] = k
+                            colour_counts[k, colour_ids[new_pos]] += 1
+                    elif owner != k:
+                        rent = base_rents[new_pos]
+                        cid = colour_ids[new_pos]
+                        if colour_counts[owner, cid] == group_sizes[cid]:
+                            rent *= 2
+                        money[k] -= rent
+                        money[owner] += rent
+                if d1 != d2:
+                    break
+                doubles += 1
+                if doubles == 3:
+                    positions[k] = jail_idx
+                    break
+    return d
+
+
+if njit is not None:
+    _play_game = njit(cache=True)(_play_game)
+
+
+def _play_games(dice, money, positions, owners, colour_counts,
+                kinds, prices, base_rents, colour_ids, group_sizes,
+                n_turns, jail_idx, n_tiles):
+    """Run every game in the batch; rows of each state array are one game.
+
+    Games are independent, so the outer loop is a prange and numba farms
+    them across cores when compiled (plain serial range otherwise).
+    """
+    for g in prange(dice.shape[0]):
+        _play_game(dice[g], money[g], positions[g], owners[g],
+                   colour_counts[g], kinds, prices, base_rents,
+                   colour_ids, group_sizes, n_turns, jail_idx, n_tiles)
+
+
+if njit is not None:
+    _play_games = njit(cache=True, parallel=True)(_play_games)
+
+
+def simulate_games(n_games, n_players=4, n_turns=50, seed=None):
+    """Run independent headless games; returns final money, shape (n_games, n_players).
+
+    Dice for the whole batch are drawn in one vectorized draw (generously
+    oversized: at most 3 rolls per player turn because of the doubles
+    rule) and all per-game state is allocated as one batched array per
+    column, so a single kernel call runs every game — in parallel across
+    cores when numba is installed.
+    """
+    rng = np.random.default_rng(seed)
+    max_rolls = n_turns * n_players * 3 + 4
+    dice = rng.integers(1, 7, size=(n_games, max_rolls, 2), dtype=np.int8)
+    money = np.full((n_games, n_players), 1500, dtype=np.int64)
+    positions = np.zeros((n_games, n_players), dtype=np.int64)
+    owners = np.full((n_games, N_TILES), -1, dtype=np.int64)
+    colour_counts = np.zeros((n_games, n_players, N_COLOURS), dtype=np.int8)
+    _play_games(dice, money, positions, owners, colour_counts,
+                KINDS, PRICES, BASE_RENTS, COLOUR_IDS, GROUP_SIZES,
+                n_turns, JAIL_IDX, N_TILES)
+    return money
@@ -39,11 +39,11 @@ for turn in range(1, 26):
         if hasattr(player, 'current_property') and player.current_property is not None:
             prop = player.current_property
             state_buy = agent._state_buy(player, prop, game)
-            q_actions = agent.q_buy.get(state_buy, None)
+            q_actions = agent.q_buy[agent._encode_buy(state_buy)]
 
-            if q_actions:
-                action_buy = max(q_actions, key=q_actions.get)
-                score = q_actions[action_buy]
+            if q_actions.any():
+                action_buy = int(q_actions.argmax())
+                score = float(q_actions[action_buy])
                 print(f"AGENT SUGGESTION — Buy {prop.name}? -> {'BUY' if action_buy==1 else 'SKIP'} (score={score:.2f})")
             else:
                 action_buy = 1 if player.money > prop.price + 100 else 0
@@ -84,17 +84,18 @@ for turn in range(1, 26):
         build_actions = agent.suggest_build(player, candidate_sets, game)
         for ba in build_actions:
             state_build = agent._state_build(player, ba.get("house_price", 0), game)
-            q_build = agent.q_build.get(state_build, None)
-            if q_build:
-                action_build = max(q_build, key=q_build.get)
-                score = q_build[action_build]
+            q_build = agent.q_build[agent._encode_build(state_build)]
+            if q_build.any():
+                action_build = int(q_build.argmax())
+                score = float(q_build[action_build])
                 print(f"AGENT SUGGESTION — Build on {ba['colour']}? -> {'BUILD' if action_build==1 else 'SKIP'} (score={score:.2f})")
             else:
                 action_build = 1 if ba["action"] == "build" else 0
                 print(f"AGENT SUGGESTION — Build on {ba['colour']}? -> {'BUILD' if action_build==1 else 'SKIP'} (score=0.00) — No Q-data fallback")
 
             if action_build == 1:
-                player.build_houses(ba["colour"])
+                player.build_houses(ba["colour"],
+                                    group=candidate_sets.get(ba["colour"]))
                 print(f"🏠 {player.name} built houses on {ba['colour']} set.")
 
 
@@ -1,9 +1,184 @@
+import functools
+import heapq
 import random
-from Monopoly.property import Property
-from itertools import combinations 
-from collections import defaultdict 
+import numpy as np
+from Monopoly.property import Property, _KIND_UTILITY
+from Monopoly.board import (COLOUR_MASKS, COLOUR_TOTALS, ALL_PROPERTIES,
+                            PROPERTIES_BY_COLOUR, PROPERTY_PRICES,
+                            PROPERTY_HOUSE_PRICES, TILE_KINDS, tile_kind, tiles)
+from collections import defaultdict
+
+# One bit per colour group, so per-player "already announced this set"
+# state is an int and membership is a single AND instead of a str hash.
+COLOUR_BITS = {colour: 1 << i for i, colour in enumerate(COLOUR_MASKS)}
+
+# Sentinel for the go-to-jail card outcome: an identity test (`is`)
+# instead of a string compare on every draw.
+_JAIL = object()
+
+# The simplified Chance/Community Chest deck, hoisted so draw_card picks
+# from a constant tuple instead of rebuilding the card list every landing.
+_CARDS = (
+    ("Bank error in your favor, gain £200", 200),
+    ("Doctor's fees, lose £50", -50),
+    ("From sale of stock, gain £50", 50),
+    ("Go to Jail", _JAIL),
+    ("Grand Opera Night, pay £100", -100),
+    ("Income tax refund, gain £20", 20),
+)
+
+# Optional numba, same pattern as Markovchain: the per-turn dice state
+# machine compiles to a tight loop when available.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _roll_turn(dice, start_idx, position, board_len):
+    """Numeric core of a normal (non-jail) turn.
+
+    Consumes rows of the shared dice buffer until a non-double, tracking
+    the three-doubles jail rule and passing Go. Returns
+    (rows_used, new_position, doubles_count, went_to_jail, go_laps,
+    last_roll_total). Plain ints/arrays only so the body is
+    numba-compilable; decorated below when numba is available.
+    """
+    total_steps = 0
+    doubles = 0
+    i = start_idx
+    last_sum = 0
+    while True:
+        d1 = dice[i, 0]
+        d2 = dice[i, 1]
+        i += 1
+        last_sum = d1 + d2
+        total_steps += last_sum
+        if d1 == d2:
+            doubles += 1
+            if doubles == 3:
+                return i - start_idx, -1, doubles, True, False, last_sum
+            continue
+        break
+    # Lap-based Go detection: integer division counts crossings directly,
+    # with no wrap-around compare, and stays correct if a turn ever covers
+    # more than one lap.
+    total = position + total_steps
+    laps = total // board_len
+    return i - start_idx, total - laps * board_len, doubles, False, laps, last_sum
+
+
+if njit is not None:
+    _roll_turn = njit(cache=True)(_roll_turn)
+
+
+@functools.lru_cache(maxsize=256)
+def _min_subset_sum(prices, needed):
+    """Smallest subset sum of `prices` that is >= `needed`, or None.
+
+    All subset sums are enumerated with an arbitrary-precision int used as
+    a bitset: bit s of `reachable` marks sum s, and each price folds in via
+    `reachable |= reachable << price`. A minimal qualifying sum is always
+    below needed + max(prices), so the bitset is masked to that width.
+    Cached on the (prices, needed) pair — late-game turns query the same
+    property sets repeatedly.
+    """
+    if not prices:
+        return None
+    width = needed + max(prices) + 1
+    mask = (1 << width) - 1
+    reachable = 1
+    for price in prices:
+        reachable = (reachable | (reachable << price)) & mask
+    qualifying = reachable >> needed
+    if qualifying == 0:
+        return None
+    return needed + ((qualifying & -qualifying).bit_length() - 1)
+
+
+def _net_worths(players):
+    """Net worth of every player in one vectorized pass over the board.
+
+    Gathers the dynamic columns (owner, mortgage, buildings) once, values
+    every property branch-free, and bin-sums by owner — instead of a
+    Python attribute walk per player per property.
+    """
+    index = {id(pl): k for k, pl in enumerate(players)}
+    owner = np.array([index.get(id(p.owner), -1) for p in ALL_PROPERTIES])
+    mortgaged = np.array([p.mortgaged for p in ALL_PROPERTIES])
+    houses = np.array([p.houses for p in ALL_PROPERTIES], dtype=np.float64)
+    hotel = np.array([p.hotel for p in ALL_PROPERTIES])
+    value = np.where(mortgaged, PROPERTY_PRICES * 0.5, PROPERTY_PRICES)
+    value += np.where(hotel, PROPERTY_HOUSE_PRICES * 2,
+                      houses * PROPERTY_HOUSE_PRICES * 0.5)
+    totals = np.bincount(owner + 1, weights=value, minlength=len(players) + 1)[1:]
+    return [pl.money + totals[k] for k, pl in enumerate(players)]
+
+
+def _subset_for_sum(props, prices, target):
+    """Reconstruct a subset of `props` whose prices sum to `target`.
+
+    Walks the prices in reverse against the prefix reachability bitsets,
+    taking an item whenever the remainder stays reachable without it.
+    """
+    prefixes = [1]
+    for price in prices:
+        prefixes.append(prefixes[-1] | (prefixes[-1] << price))
+    chosen = []
+    remaining = target
+    for i in range(len(prices) - 1, -1, -1):
+        price = prices[i]
+        if remaining >= price and (prefixes[i] >> (remaining - price)) & 1:
+            chosen.append(props[i])
+            remaining -= price
+    return chosen
+
 
 class Player:
+    # No per-instance __dict__: players are created fresh for every simulated
+    # game and their attributes sit in the hottest loops, so slot storage
+    # saves memory and a dict lookup per access.
+    __slots__ = ('name', 'position', 'money', 'in_jail', 'jail_turns',
+                 'doubles_count', 'board', 'properties', '_colour_counts',
+                 '_full_sets', '_announced_sets', 'game', 'human',
+                 'last_roll_total', 'current_property',
+                 '_sorted_dirty', '_cached_sort', '_owned_price_total',
+                 '_props_by_colour', '_tile_kinds', '_mortgageable_heap',
+                 '_total_expected_rent_cache', '_plain_props', '_n_tiles')
+
+    # Shared dice buffer: rolls are drawn in bulk from numpy and consumed one
+    # row at a time, amortizing RNG and call overhead across all players.
+    _dice_buffer = None
+    _dice_idx = 0
+    # Shared pool of uniform draws for the various decision coin-flips,
+    # refilled in bulk from one Generator for the same reason.
+    _rng = np.random.default_rng()
+    _rnd_pool = None
+    _rnd_i = 0
+
+    @classmethod
+    def seed_rng(cls, seed):
+        """Reseed the shared generator and drop buffered draws.
+
+        All player randomness (dice, decision coin-flips, card draws)
+        comes from one batched stream, so reseeding here makes a whole
+        simulation reproducible.
+        """
+        cls._rng = np.random.default_rng(seed)
+        cls._rnd_pool = None
+        cls._rnd_i = 0
+        cls._dice_buffer = None
+        cls._dice_idx = 0
+
+    def _next_rnd(self):
+        """Next uniform [0, 1) draw from the shared batched pool."""
+        if Player._rnd_pool is None or Player._rnd_i >= len(Player._rnd_pool):
+            Player._rnd_pool = Player._rng.random(4096)
+            Player._rnd_i = 0
+        v = Player._rnd_pool[Player._rnd_i]
+        Player._rnd_i += 1
+        return v
+
     def __init__(self, name="Player", board=None, human=False):
         self.name = name
         self.position = 0
@@ -12,21 +187,67 @@ class Player:
         self.jail_turns = 0
         self.doubles_count = 0
         self.board = board if board else []
-        self.properties = []
-        self._announced_sets = set()
+        self._n_tiles = len(self.board)  # board length never changes; skip per-move len()
+        # Per-position KIND_* codes for handle_tile's dispatch table; the
+        # board never changes after construction.
+        self._tile_kinds = (TILE_KINDS if self.board is tiles
+                            else tuple(tile_kind(t) for t in self.board))
+        # Insertion-ordered dict keyed by Property: iterates like the old
+        # list but gives O(1) membership tests in the trade/auction paths.
+        self.properties = {}
+        self._colour_counts = defaultdict(int)  # owned props per colour, updated by the hooks
+        self._full_sets = 0  # COLOUR_BITS bitmask of fully owned colours, updated by the hooks
+        self._owned_price_total = 0  # sum of owned purchase prices, updated by the hooks
+        self._props_by_colour = defaultdict(list)  # owned props grouped by colour, updated by the hooks
+        # Max-heap (by mortgage value) of possibly-mortgageable properties.
+        # Entries go stale when a property gains houses or changes hands;
+        # ensure_non_negative_balance revalidates on pop.
+        self._mortgageable_heap = []
+        self._total_expected_rent_cache = None  # (p_land, total), see total_expected_rent
+        # Owned properties that are unmortgaged with no buildings — the
+        # mortgage-candidate filter, kept live (insertion-ordered dict used
+        # as a set, like self.properties).
+        self._plain_props = {}
+        self._announced_sets = 0  # COLOUR_BITS bitmask of sets already announced
         self.game = None
         self.human = human  # New flag for human-controlled player
+        self.last_roll_total = 0
+        self.current_property = None  # set by the game loop on unowned tiles
+        self._sorted_dirty = True  # invalidates _sorted_props_desc
+        self._cached_sort = ()
+
+    def _input(self, prompt):
+        """Read a line via the game's pluggable input provider.
+
+        Defaults to builtins input; training harnesses can set
+        game.input_provider to a scripted callable so simulations never
+        block on stdin.
+        """
+        return getattr(self.game, "input_provider", input)(prompt)
+
+    @property
+    def _verbose(self):
+        """Whether this player's game wants narration printed.
+
+        Prints are guarded at each call site (``if self._verbose: print(...)``)
+        so headless training never pays for f-string formatting or stdout.
+        """
+        return getattr(self.game, "verbose", True)
 
 
     def roll_dice(self):
-        die1 = random.randint(1, 6)
-        die2 = random.randint(1, 6)
+        if Player._dice_buffer is None or Player._dice_idx >= len(Player._dice_buffer):
+            Player._dice_buffer = Player._rng.integers(1, 7, size=(8192, 2), dtype=np.int8)
+            Player._dice_idx = 0
+        die1 = int(Player._dice_buffer[Player._dice_idx, 0])
+        die2 = int(Player._dice_buffer[Player._dice_idx, 1])
+        Player._dice_idx += 1
         self.last_roll_total = die1 + die2
-        print(f"{self.name} rolls: {die1} + {die2} = {die1 + die2}")
+        if self._verbose: print(f"{self.name} rolls: {die1} + {die2} = {die1 + die2}")
         return die1, die2
 
     def go_to_jail(self):
-        print(f"{self.name} is sent to jail!")
+        if self._verbose: print(f"{self.name} is sent to jail!")
         self.position = 10  # Jail tile index
         self.in_jail = True
         self.jail_turns = 0
@@ -34,60 +255,142 @@ class Player:
     def handle_jail(self):
         if not self.in_jail:
             return
-        agent = getattr(self.game, "agent", None)
+        agent = self.game.agent
         suggestion = None
         if agent:
             suggestion = agent.suggest_jail_action(self, self.game)
-            advice_text = self.score_to_advice(suggestion['score'])
-            print(f"AGENT SUGGESTION — Jail action: {suggestion['action']} ({advice_text}) — {suggestion['reason']}")
+            if self._verbose:
+                advice_text = self.score_to_advice(suggestion['score'])
+                print(f"AGENT SUGGESTION — Jail action: {suggestion['action']} ({advice_text}) — {suggestion['reason']}")
 
         if self.human:
-            choice = input("Type 'pay' to pay £50, 'roll' to attempt doubles, or 'stay': ").strip().lower()
+            choice = self._input("Type 'pay' to pay £50, 'roll' to attempt doubles, or 'stay': ").strip().lower()
             if choice == 'pay':
                 self.money -= 50
                 self.in_jail = False
-                print(f"{self.name} pays £50 to get out of jail.")
+                if self._verbose: print(f"{self.name} pays £50 to get out of jail.")
             elif choice == 'roll':
                 die1, die2 = self.roll_dice()
-                if die1 == die2:
-                    self.in_jail = False
-                    print(f"{self.name} rolled doubles and is released!")
+                released, moved = self._resolve_jail(die1, die2)
+                if released:
+                    if die1 == die2:
+                        if self._verbose: print(f"{self.name} rolled doubles and is released!")
+                    else:
+                        if self._verbose: print(f"{self.name} pays £50 to get out of jail.")
                 else:
-                    print(f"{self.name} stays in jail.")
+                    if self._verbose: print(f"{self.name} stays in jail.")
+                if moved:
+                    self.handle_tile()
             else:
-                print(f"{self.name} stays in jail.")
+                if self._verbose: print(f"{self.name} stays in jail.")
         else:
             # AI-controlled: 70% chance to follow suggestion
-            follow_ai = random.random() < 0.7
+            follow_ai = self._next_rnd() < 0.7
             if follow_ai and suggestion and suggestion['action'] == 'pay':
                 self.money -= 50
                 self.in_jail = False
-                print(f"{self.name} pays £50 to get out of jail (AI choice).")
+                if self._verbose: print(f"{self.name} pays £50 to get out of jail (AI choice).")
             else:
-                print(f"{self.name} stays in jail.")
+                if self._verbose: print(f"{self.name} stays in jail.")
+
+    def _gain_property(self, property_tile):
+        """Add a property to this player, keeping the ownership caches in sync."""
+        self.properties[property_tile] = None
+        colour = property_tile.colour
+        self._colour_counts[colour] += 1
+        if self._colour_counts[colour] == COLOUR_TOTALS.get(colour):
+            self._full_sets |= COLOUR_BITS[colour]
+        self._props_by_colour[colour].append(property_tile)
+        self._owned_price_total += property_tile.price
+        self._push_mortgageable(property_tile)
+        if property_tile.can_mortgage():
+            self._plain_props[property_tile] = None
+        self._total_expected_rent_cache = None
+        self._sorted_dirty = True
+
+    def _lose_property(self, property_tile):
+        """Remove a property from this player, keeping the ownership caches in sync."""
+        del self.properties[property_tile]
+        colour = property_tile.colour
+        self._colour_counts[colour] -= 1
+        self._full_sets &= ~COLOUR_BITS.get(colour, 0)
+        self._props_by_colour[colour].remove(property_tile)
+        self._owned_price_total -= property_tile.price
+        self._plain_props.pop(property_tile, None)
+        self._total_expected_rent_cache = None
+        self._sorted_dirty = True
+
+    def _push_mortgageable(self, prop):
+        """Record a property as a mortgage candidate if currently eligible."""
+        if prop.can_mortgage():
+            heapq.heappush(self._mortgageable_heap,
+                           (-prop.mortgage_value, id(prop), prop))
+
+    def net_worth(self):
+        """Cash plus purchase price of everything owned (O(1) via the hooks)."""
+        return self.money + self._owned_price_total
+
+    def total_expected_rent(self, p_land=0.05):
+        """Sum of expected_rent over all owned properties, cached.
+
+        Invalidated by the ownership hooks and by anything that changes a
+        property's rent (builds, house sales, mortgages), so the repeated
+        training-loop reads cost one comparison.
+        """
+        cache = self._total_expected_rent_cache
+        if cache is not None and cache[0] == p_land:
+            return cache[1]
+        total = sum(
+            p.expected_rent(p_land=p_land,
+                            owns_full_colour_set=self._owns_full_colour_set(p.colour))
+            for p in self.properties)
+        self._total_expected_rent_cache = (p_land, total)
+        return total
+
+    def _sorted_props_desc(self):
+        """This player's properties, most expensive house price first.
+
+        House prices never change, so the sort only needs redoing after the
+        ownership hooks flip _sorted_dirty; sell/build paths then filter the
+        cached tuple instead of re-sorting per call.
+        """
+        if self._sorted_dirty:
+            self._cached_sort = tuple(
+                sorted(self.properties, key=lambda p: -p.house_price))
+            self._sorted_dirty = False
+        return self._cached_sort
 
     def _owns_full_colour_set(self, colour):
-        """Check if player owns all properties of a given colour"""
-        colour_props = [tile for tile in self.board if isinstance(tile, Property) and getattr(tile, "colour", None) == colour]
-        return all(getattr(p, "owner", None) == self for p in colour_props)
+        """Check if player owns all properties of a given colour (one bit test)."""
+        return bool(self._full_sets & COLOUR_BITS.get(colour, 0))
+
+    def full_colour_sets(self):
+        """Colour names whose group this player fully owns.
+
+        Decoded from the hook-maintained bitmask, so it is O(colour
+        groups) regardless of portfolio size - callers should prefer this
+        over re-scanning properties with _owns_full_colour_set per colour.
+        """
+        full_sets = self._full_sets
+        return {colour for colour, bit in COLOUR_BITS.items() if full_sets & bit}
 
 
     def buy_property(self, property_tile):
         """Attempt to buy a property, respecting agent advice and human input"""
-        agent = getattr(self.game, "agent", None)
+        agent = self.game.agent
         buy_action = True
 
         # Agent suggestion
         if agent:
             suggestion = agent.suggest_buy(self, property_tile, self.game)
-            print(f"AGENT SUGGESTION — Buy {property_tile.name}? -> {suggestion['action'].upper()} "
+            if self._verbose: print(f"AGENT SUGGESTION — Buy {property_tile.name}? -> {suggestion['action'].upper()} "
                   f"(score={suggestion.get('score',0):.2f}) — {suggestion.get('reason')}")
             if not self.human and suggestion['action'] == "skip":
                 buy_action = False
 
         # Human input
         if self.human:
-            choice = input(f"{self.name}, do you want to buy {property_tile.name} for £{property_tile.price}? (y/n, Enter=agent suggestion): ").strip().lower()
+            choice = self._input(f"{self.name}, do you want to buy {property_tile.name} for £{property_tile.price}? (y/n, Enter=agent suggestion): ").strip().lower()
             if choice == "y":
                 buy_action = True
             elif choice == "n":
@@ -96,22 +399,22 @@ class Player:
                 buy_action = suggestion['action'] == "buy"
 
         if buy_action and self.money >= property_tile.price:
-            print(f"{self.name} buys {property_tile.name} for £{property_tile.price}")
+            if self._verbose: print(f"{self.name} buys {property_tile.name} for £{property_tile.price}")
             self.money -= property_tile.price
             property_tile.owner = self
-            self.properties.append(property_tile)
-            print(f"New balance: £{self.money}")
-            if self._owns_full_colour_set(property_tile.colour) and property_tile.colour not in self._announced_sets:
-                print(f"✨ {self.name} now owns all {property_tile.colour} properties!")
-                self._announced_sets.add(property_tile.colour)
+            self._gain_property(property_tile)
+            if self._verbose: print(f"New balance: £{self.money}")
+            if self._owns_full_colour_set(property_tile.colour) and not (self._announced_sets & COLOUR_BITS[property_tile.colour]):
+                if self._verbose: print(f"✨ {self.name} now owns all {property_tile.colour} properties!")
+                self._announced_sets |= COLOUR_BITS[property_tile.colour]
             self.ensure_non_negative_balance()
             return True
         elif not buy_action:
-            print(f"{self.name} chooses NOT to buy {property_tile.name}")
+            if self._verbose: print(f"{self.name} chooses NOT to buy {property_tile.name}")
             self.auction_property(property_tile)
             return False
         else:
-            print(f"{self.name} cannot afford {property_tile.name}")
+            if self._verbose: print(f"{self.name} cannot afford {property_tile.name}")
             return False
     def decide_buy_property(self, prop, agent):
         """
@@ -125,7 +428,7 @@ class Player:
         action = agent.select_action(self, "buy", state)  # 1=buy, 0=skip
         q_val = agent.q_buy.get(state, {}).get(action, None)
 
-        print(f"{self.name} evaluating {prop.name}: Q-value={q_val}, action={'Buy' if action==1 else 'Skip'}")
+        if self._verbose: print(f"{self.name} evaluating {prop.name}: Q-value={q_val}, action={'Buy' if action==1 else 'Skip'}")
 
         if action == 1 and self.money >= prop.price:
             self.buy_property(prop)
@@ -133,30 +436,34 @@ class Player:
         return False
 
     def auction_property(self, property_tile):
-        print(f"🏷️ Auction started for {property_tile.name} (£{property_tile.price})")
-        active_bidders = [p for p in self.game.players if p.money > 0]
+        if self._verbose: print(f"🏷️ Auction started for {property_tile.name} (£{property_tile.price})")
+        active_bidders = {p for p in self.game.players if p.money > 0}
         highest_bid = property_tile.price - 1
         highest_bidder = None
         passed_players = set()
 
+        # The bid base/ceiling are constant for the whole auction and the
+        # random offsets are batched, so each ai_bid call is just arithmetic.
+        base = property_tile.price
+        ceiling = int(1.2 * base)
+        offsets = Player._rng.integers(5, 21, size=64)
+        offset_i = 0
+
         def ai_bid(player, current_highest):
             # Simple AI: bid up to 1.2x property price if cash allows, scaled to player money
-            max_afford = player.money
-            base = property_tile.price
-            bid = min(base + random.randint(5, 20), int(1.2 * base), max_afford)
+            nonlocal offset_i
+            bid = min(base + int(offsets[offset_i & 63]), ceiling, player.money)
+            offset_i += 1
             return max(bid, current_highest + 1) if bid > current_highest else 0
 
         while len(active_bidders) > 0:
             bid_in_round = False
-            for player in active_bidders[:]:
-                if player in passed_players:
-                    continue
-
+            for player in active_bidders - passed_players:
                 min_bid = highest_bid + 1
                 if player.human:
                     suggestion = ai_bid(player, highest_bid)
                     try:
-                        bid_input = input(f"{player.name}, enter your bid (current: £{highest_bid}, AI suggests £{suggestion}, 0=pass): ")
+                        bid_input = self._input(f"{player.name}, enter your bid (current: £{highest_bid}, AI suggests £{suggestion}, 0=pass): ")
                         bid = int(bid_input) if bid_input else suggestion
                     except ValueError:
                         bid = suggestion
@@ -164,14 +471,14 @@ class Player:
                     bid = ai_bid(player, highest_bid)
                     if bid == 0:
                         passed_players.add(player)
-                        print(f"{player.name} passes")
+                        if self._verbose: print(f"{player.name} passes")
                         continue
-                    print(f"{player.name} bids £{bid}")
+                    if self._verbose: print(f"{player.name} bids £{bid}")
 
                 if bid <= highest_bid or bid > player.money:
                     passed_players.add(player)
                     if player.human:
-                        print(f"{player.name} passes")
+                        if self._verbose: print(f"{player.name} passes")
                     continue
 
                 # Valid bid
@@ -183,71 +490,85 @@ class Player:
                 break
 
             # remove passed players
-            active_bidders = [p for p in active_bidders if p not in passed_players]
+            active_bidders -= passed_players
 
         if highest_bidder:
             highest_bidder.money -= highest_bid
             property_tile.owner = highest_bidder
-            highest_bidder.properties.append(property_tile)
-            print(f"🏆 {highest_bidder.name} wins the auction for {property_tile.name} at £{highest_bid}. New balance: £{highest_bidder.money}")
+            highest_bidder._gain_property(property_tile)
+            if self._verbose: print(f"🏆 {highest_bidder.name} wins the auction for {property_tile.name} at £{highest_bid}. New balance: £{highest_bidder.money}")
         else:
-            print(f"No bids placed for {property_tile.name}")
+            if self._verbose: print(f"No bids placed for {property_tile.name}")
     
     def mortgage_property(self, property_to_mortgage):
         if property_to_mortgage.owner != self:
             return False
         if property_to_mortgage.mortgaged:
-            print(f"{property_to_mortgage.name} is already mortgaged.")
+            if self._verbose: print(f"{property_to_mortgage.name} is already mortgaged.")
             return False
         if property_to_mortgage.houses > 0 or property_to_mortgage.hotel:
-            print(f"Cannot mortgage {property_to_mortgage.name} with houses or hotels built.")
+            if self._verbose: print(f"Cannot mortgage {property_to_mortgage.name} with houses or hotels built.")
             return False
         
         success = property_to_mortgage.mortgage()
         if success:
+            self._plain_props.pop(property_to_mortgage, None)
+            self._total_expected_rent_cache = None
             self.money += property_to_mortgage.mortgage_value
-            print(f"{self.name} received £{property_to_mortgage.mortgage_value} from mortgaging {property_to_mortgage.name}. Current money: £{self.money}")
+            if self._verbose: print(f"{self.name} received £{property_to_mortgage.mortgage_value} from mortgaging {property_to_mortgage.name}. Current money: £{self.money}")
             return True
         return False
     
 
     def handle_buy_property(self, property_tile):
-        if property_tile.owner or not getattr(self.game, "agent", None):
+        if property_tile.owner or not self.game.agent:
             return
         agent = self.game.agent
         suggestion = agent.suggest_buy(self, property_tile, self.game)
-        advice_text = self.score_to_advice(suggestion['score'])
-        print(f"AGENT SUGGESTION — Buy {property_tile.name}? {advice_text} | Reason: {suggestion['reason']}")
+        if self._verbose:
+            advice_text = self.score_to_advice(suggestion['score'])
+            print(f"AGENT SUGGESTION — Buy {property_tile.name}? {advice_text} | Reason: {suggestion['reason']}")
         
         if self.human:
-            choice = input("Type 'yes' to buy, 'no' to skip: ").strip().lower()
+            choice = self._input("Type 'yes' to buy, 'no' to skip: ").strip().lower()
             if choice == 'yes':
                 self.buy_property(property_tile)
         else:
-            follow_ai = random.random() < 0.2
+            follow_ai = self._next_rnd() < 0.2
             if follow_ai and suggestion['score'] > 0.5:
                 self.buy_property(property_tile)
 
+    def _complete_buildable_sets(self):
+        """Completed colour groups that are buildable and fully unmortgaged,
+        read straight off the maintained colour index."""
+        sets = {}
+        full_sets = self._full_sets
+        for colour, bit in COLOUR_BITS.items():
+            if not (full_sets & bit):
+                continue
+            group = self._props_by_colour[colour]
+            if all(p.buildable and not p.mortgaged for p in group):
+                sets[colour] = list(group)
+        return sets
+
     def handle_build_houses(self):
-        candidate_props = {}
-        for prop in self.properties:
-            if getattr(prop, "buildable", False) and not getattr(prop, "mortgaged", False) and self._owns_full_colour_set(getattr(prop, "colour", None)):
-                candidate_props.setdefault(prop.colour, []).append(prop)
+        candidate_props = self._complete_buildable_sets()
         
-        agent = getattr(self.game, "agent", None)
+        agent = self.game.agent
         if candidate_props and agent:
             build_suggestions = agent.suggest_build(self, candidate_props, self.game)
             if self.human:
-                print("\nAGENT BUILD SUGGESTIONS:")
+                if self._verbose: print("\nAGENT BUILD SUGGESTIONS:")
                 for s in build_suggestions[:3]:
-                    advice_text = self.score_to_advice(s.get('score', 0))
-                    print(f"  - {s.get('colour','?')}: {advice_text} | Reason: {s.get('reason')}")
-                choice = input("Type colour to build on or 'skip': ").strip()
+                    if self._verbose:
+                        advice_text = self.score_to_advice(s.get('score', 0))
+                        print(f"  - {s.get('colour','?')}: {advice_text} | Reason: {s.get('reason')}")
+                choice = self._input("Type colour to build on or 'skip': ").strip()
                 if choice in candidate_props:
-                    print(f"Building on {choice}...")
+                    if self._verbose: print(f"Building on {choice}...")
                     self.build_houses()
             else:
-                follow_ai = random.random() < 0.7
+                follow_ai = self._next_rnd() < 0.7
                 if follow_ai:
                     self.build_houses()
 
@@ -271,175 +592,209 @@ class Player:
         
         cost = property_to_unmortgage.unmortgage_cost()
         if self.money < cost:
-            print(f"{self.name} cannot afford to unmortgage {property_to_unmortgage.name}. Needs £{cost:.2f}, has £{self.money}.")
+            if self._verbose: print(f"{self.name} cannot afford to unmortgage {property_to_unmortgage.name}. Needs £{cost:.2f}, has £{self.money}.")
             return False
         self.money -= cost
-        print(f"{self.name} paid £{cost:.2f} to unmortgage {property_to_unmortgage.name}. Remaining money: £{self.money}")
+        if self._verbose: print(f"{self.name} paid £{cost:.2f} to unmortgage {property_to_unmortgage.name}. Remaining money: £{self.money}")
         if not self.ensure_non_negative_balance():  # Added after unmortgage
             return False
         return True
 
 
     def attempt_trade(self):
-        all_properties = [tile for tile in self.board if isinstance(tile, Property)]
-        agent = getattr(self.game, "agent", None)
+        all_properties = ALL_PROPERTIES
+        agent = self.game.agent
         if agent is not None:
            trade_suggestions = agent.suggest_trade(self, [p for p in self.game.players if p != self], self.game)
            if trade_suggestions:
-            print("AGENT TRADE SUGGESTIONS:")
+            if self._verbose: print("AGENT TRADE SUGGESTIONS:")
             for s in trade_suggestions[:3]:
               tgt = getattr(s.get("target"), "name", None)
-              print(f"  - For {tgt}: offer {s['offer']} | EV≈{s.get('expected_value_gain'):.2f} | {s.get('reason')}")
-
+              if self._verbose: print(f"  - For {tgt}: offer {s['offer']} | EV≈{s.get('expected_value_gain'):.2f} | {s.get('reason')}")
+
+
+        # Completed sets can't change mid-search (a successful trade returns
+        # immediately), so the maintained full-set mask is the blocked-colour
+        # mask for the whole attempt.
+        my_completed = self._full_sets
+
+        # Only colour groups one property short of completion can yield a
+        # trade, and that set can't change until a trade succeeds — compute
+        # it once instead of re-testing every group per opponent.
+        near_complete = [
+            (colour, props) for colour, props in self._props_by_colour.items()
+            if self._colour_counts[colour] == COLOUR_TOTALS.get(colour, 0) - 1
+        ]
+        if not near_complete:
+            return False
 
         for other_player in self.game.players:
             if other_player == self:
                 continue
 
-            colours = set(p.colour for p in self.properties)
-            for colour in colours:
-                colour_props = [p for p in all_properties if p.colour == colour]
-                self_props_of_colour = [p for p in self.properties if p.colour == colour]
+            for colour, self_props_of_colour in near_complete:
+                colour_props = PROPERTIES_BY_COLOUR[colour]
+                # Exactly one property is missing; stop at the first match
+                # (identity test — tiles are singletons) instead of building
+                # a list.
+                desired_prop = next(
+                    (p for p in colour_props if p.owner is other_player), None)
+                if desired_prop is None:
+                    continue
+
+                trade_type = 'cash' if self._next_rnd() < 0.5 else 'property'
+
+                if trade_type == 'cash':
+                    required_cash = int(desired_prop.price * 1.5)
+
+                    if self.money < required_cash:
+                        unmortgage_candidates = [
+                            p for p in self._plain_props if p != desired_prop
+                        ]
+                        for prop_to_mortgage in unmortgage_candidates:
+                            if self.money >= required_cash:
+                                break
+                            self.mortgage_property(prop_to_mortgage)
+
+                    if self.money >= required_cash:
+                        if self._verbose: print(f"{self.name} offers £{required_cash} cash to {other_player.name} for {desired_prop.name} (worth £{desired_prop.price})")
+                        self.money -= required_cash
+                        other_player.money += required_cash
+                        if not self.ensure_non_negative_balance():  # Added after trade
+                           return False                            
+
+                        desired_prop.owner = self
+                        other_player._lose_property(desired_prop)
+                        self._gain_property(desired_prop)
+                        self.ensure_non_negative_balance()
+                        if self._owns_full_colour_set(desired_prop.colour) and not (self._announced_sets & COLOUR_BITS[desired_prop.colour]):
+                            if self._verbose: print(f"✨ {self.name} now owns all {desired_prop.colour} properties!")
+                            self._announced_sets |= COLOUR_BITS[desired_prop.colour]
+
+                        if self._verbose: print(f"Trade complete: {self.name} now owns {desired_prop.name}.")
+                        return True
+                    else:
+                        continue
 
-                if len(self_props_of_colour) == len(colour_props) - 1:
-                    missing_props = [p for p in colour_props if p.owner == other_player and p not in self_props_of_colour]
-                    if not missing_props:
+                else:  # trade_type == 'property'
+                    needed_value = int(desired_prop.price * 1.25)
+
+                    # Never offer properties from a completed colour set
+                    # (my_completed is hoisted above), so no per-combo
+                    # set-breaking scan is needed below.
+                    tradable = sorted(
+                        (p for p in self.properties
+                         if p != desired_prop
+                         and not (my_completed & COLOUR_BITS.get(p.colour, 0))),
+                        key=lambda p: p.price)
+
+                    # Exact minimum-overpay offer via the bitset
+                    # subset-sum DP (cached per price tuple).
+                    prices = tuple(p.price for p in tradable)
+                    combo_value = _min_subset_sum(prices, needed_value)
+                    if combo_value is None:
                         continue
-                    desired_prop = missing_props[0]
-
-                    trade_type = random.choice(['cash', 'property'])
-
-                    if trade_type == 'cash':
-                        required_cash = int(desired_prop.price * 1.5)
-
-                        if self.money < required_cash:
-                            unmortgage_candidates = [
-                                p for p in self.properties
-                                if not p.mortgaged and p.houses == 0 and not p.hotel and p != desired_prop
-                            ]
-                            for prop_to_mortgage in unmortgage_candidates:
-                                if self.money >= required_cash:
-                                    break
-                                self.mortgage_property(prop_to_mortgage)
-
-                        if self.money >= required_cash:
-                            print(f"{self.name} offers £{required_cash} cash to {other_player.name} for {desired_prop.name} (worth £{desired_prop.price})")
-                            self.money -= required_cash
-                            other_player.money += required_cash
-                            if not self.ensure_non_negative_balance():  # Added after trade
-                               return False                            
-
-                            desired_prop.owner = self
-                            other_player.properties.remove(desired_prop)
-                            self.properties.append(desired_prop)
-                            self.ensure_non_negative_balance()
-                            if self._owns_full_colour_set(desired_prop.colour) and desired_prop.colour not in self._announced_sets:
-                                print(f"✨ {self.name} now owns all {desired_prop.colour} properties!")
-                                self._announced_sets.add(desired_prop.colour)
-
-                            print(f"Trade complete: {self.name} now owns {desired_prop.name}.")
-                            return True
-                        else:
-                            continue
-
-                    else:  # trade_type == 'property'
-                        my_props = [p for p in self.properties if p != desired_prop]
-                        needed_value = int(desired_prop.price * 1.25)
-
-                        for r in range(1, len(my_props) + 1):
-                            for combo in combinations(my_props, r):
-                                combo_value = sum(p.price for p in combo)
-
-                                if combo_value >= needed_value:
-                                    breaking_set = False
-                                    warned = False  # To show warning only once
-
-                                    # Check if trading away any property breaks a full set
-                                    post_trade_props = [p for p in self.properties if p not in combo] + [desired_prop]
-                                    for colour in set(p.colour for p in self.properties):
-                                       full_set = [tile for tile in self.board if isinstance(tile, Property) and tile.colour == colour]
-                                       owns_full_set_now = all(p in self.properties for p in full_set)
-                                       owns_full_set_after = all(p in post_trade_props for p in full_set)
-
-                                       if owns_full_set_now and not owns_full_set_after:
-                                          print(f"⚠️ Trade blocked: {self.name} would lose their full {colour} colour set!")
-                                          breaking_set = True
-                                          break
-                                    
-
-                                    # Also check if desired property's colour set would be broken
-                                    desired_colour_props = [tile for tile in self.board if isinstance(tile, Property) and tile.colour == desired_prop.colour]
-                                    if all(prop in self.properties for prop in desired_colour_props):
-                                        if any(p.colour == desired_prop.colour for p in combo):
-                                            if not warned:
-                                                print(f"⚠️ Trade blocked: {self.name} would lose their {desired_prop.colour} colour set!")
-                                                warned = True
-                                            breaking_set = True
-
-                                    if breaking_set:
-                                        continue
-
-                                    # No breaking, perform trade
-                                    offered_names = ', '.join(p.name for p in combo)
-                                    print(f"{self.name} offers {offered_names} (worth £{combo_value}) to {other_player.name} for {desired_prop.name} (worth £{desired_prop.price})")
-
-                                    for p in combo:
-                                        p.owner = other_player
-                                        self.properties.remove(p)
-                                        other_player.properties.append(p)
-
-                                    desired_prop.owner = self
-                                    other_player.properties.remove(desired_prop)
-                                    self.properties.append(desired_prop)
-
-                                    if self._owns_full_colour_set(desired_prop.colour) and desired_prop.colour not in self._announced_sets:
-                                        print(f"✨ {self.name} now owns all {desired_prop.colour} properties!")
-                                        self._announced_sets.add(desired_prop.colour)
-                                    
-
-                                    print(f"Trade complete: {self.name} now owns {desired_prop.name}.")
-                                    mortgaged_props_self = [p.name for p in self.properties if p.mortgage]
-                                    if mortgaged_props_self:
-                                      print(f"💤 {self.name} has properties: {', '.join(mortgaged_props_self)}")
-
-                                    mortgaged_props_other = [p.name for p in other_player.properties if p.mortgage]
-                                    if mortgaged_props_other:
-                                      print(f"💤 {other_player.name} has properties: {', '.join(mortgaged_props_other)}")
+                    combo = _subset_for_sum(tradable, prices, combo_value)
 
-    
-                                    return True
+                    if self._verbose:
+                        offered_names = ', '.join(p.name for p in combo)
+                        print(f"{self.name} offers {offered_names} (worth £{combo_value}) to {other_player.name} for {desired_prop.name} (worth £{desired_prop.price})")
+
+                    for p in combo:
+                        p.owner = other_player
+                        self._lose_property(p)
+                        other_player._gain_property(p)
+
+                    desired_prop.owner = self
+                    other_player._lose_property(desired_prop)
+                    self._gain_property(desired_prop)
+
+                    if self._owns_full_colour_set(desired_prop.colour) and not (self._announced_sets & COLOUR_BITS[desired_prop.colour]):
+                        if self._verbose: print(f"✨ {self.name} now owns all {desired_prop.colour} properties!")
+                        self._announced_sets |= COLOUR_BITS[desired_prop.colour]
+
+                    if self._verbose:
+                        print(f"Trade complete: {self.name} now owns {desired_prop.name}.")
+                        # Purely narrative summaries — only worth the
+                        # two property sweeps when someone is reading.
+                        mortgaged_props_self = [p.name for p in self.properties if p.mortgaged]
+                        if mortgaged_props_self:
+                            print(f"💤 {self.name} has properties: {', '.join(mortgaged_props_self)}")
+
+                        mortgaged_props_other = [p.name for p in other_player.properties if p.mortgaged]
+                        if mortgaged_props_other:
+                            print(f"💤 {other_player.name} has properties: {', '.join(mortgaged_props_other)}")
+
+                    return True
 
         return False
     
+    def _resolve_jail(self, die1, die2):
+        """Apply one jail turn's dice outcome to the player state.
+
+        Doubles release immediately; after the third failed turn the £50
+        fine is paid and the player is released. Returns (released, moved)
+        where moved means the player advanced and handle_tile is due.
+        Shared by move() and handle_jail so the jail rules live in one place.
+        """
+        released = die1 == die2
+        if not released:
+            self.jail_turns += 1
+            if self.jail_turns >= 3:
+                self.money -= 50
+                released = True
+        if released:
+            # Single release-and-move block for both outcomes (doubles or
+            # third-turn fine) — the two paths only differ in how release
+            # was earned, not in what happens next.
+            self.in_jail = False
+            self.jail_turns = 0
+            self.position = (self.position + die1 + die2) % self._n_tiles
+            return True, True
+        return False, False
+
     def move(self):
+        board = self.board  # LOAD_FAST beats repeated LOAD_ATTR in this hot method
 
         if self.in_jail:
-         agent = getattr(self.game, "agent", None)
-         if agent is not None:
-            jail_sugg = agent.suggest_jail_action(self, self.game)
-            print(f"AGENT SUGGESTION — Jail action: {jail_sugg['action']} "
-                  f"(score={jail_sugg.get('score',0):.2f}) — {jail_sugg.get('reason')}")
-
+            agent = self.game.agent
+            if agent is not None:
+                jail_sugg = agent.suggest_jail_action(self, self.game)
+                if self._verbose: print(f"AGENT SUGGESTION — Jail action: {jail_sugg['action']} "
+                      f"(score={jail_sugg.get('score',0):.2f}) — {jail_sugg.get('reason')}")
 
-            print(f"{self.name} is in jail (Turn {self.jail_turns + 1}/3).")
+            if self._verbose: print(f"{self.name} is in jail (Turn {self.jail_turns + 1}/3).")
             die1, die2 = self.roll_dice()
-            if die1 == die2:
-                print(f"{self.name} rolled doubles and is released from jail!")
-                self.in_jail = False
-                self.jail_turns = 0
-                self.position = (self.position + die1 + die2) % len(self.board)
-                self.handle_tile()
-            else:
-                self.jail_turns += 1
-                if self.jail_turns >= 3:
-                    print(f"{self.name} pays £50 to get out of jail and lands on {self.board[self.position+ die1 + die2]}")
-                    self.money -= 50
-                    self.in_jail = False
-                    self.jail_turns = 0
-                    self.position = (self.position + die1 + die2) % len(self.board)
-                    self.handle_tile()
+            released, moved = self._resolve_jail(die1, die2)
+            if released:
+                if die1 == die2:
+                    if self._verbose: print(f"{self.name} rolled doubles and is released from jail!")
                 else:
-                    print(f"{self.name} stays in jail.")
+                    if self._verbose: print(f"{self.name} pays £50 to get out of jail and lands on {board[self.position]}")
+            else:
+                if self._verbose: print(f"{self.name} stays in jail.")
+            if moved:
+                self.handle_tile()
+            return
+
+        if not self._verbose:
+            # Headless fast path: run the whole dice/doubles/passed-go state
+            # machine in the (optionally compiled) kernel. Keep at least 4
+            # buffer rows free — a turn consumes at most 3 rolls.
+            if Player._dice_buffer is None or Player._dice_idx > len(Player._dice_buffer) - 4:
+                Player._dice_buffer = Player._rng.integers(1, 7, size=(8192, 2), dtype=np.int8)
+                Player._dice_idx = 0
+            used, new_pos, doubles, jailed, go_laps, last_sum = _roll_turn(
+                Player._dice_buffer, Player._dice_idx, self.position, self._n_tiles)
+            Player._dice_idx += used
+            self.last_roll_total = int(last_sum)
+            self.doubles_count = int(doubles)
+            if jailed:
+                self.go_to_jail()
+                return
+            self.position = int(new_pos)
+            self.money += 200 * int(go_laps)
+            self.handle_tile()
             return
 
         total_steps = 0
@@ -453,123 +808,31 @@ class Player:
             if die1 == die2:
                 self.doubles_count += 1
                 if self.doubles_count == 3:
-                    print(f"{self.name} rolled three doubles in a row and is sent to jail!")
+                    if self._verbose: print(f"{self.name} rolled three doubles in a row and is sent to jail!")
                     self.go_to_jail()
                     return
-                print(f"{self.name} rolled doubles and will roll again!")
+                if self._verbose: print(f"{self.name} rolled doubles and will roll again!")
                 continue
             else:
                 break
 
-        prev_position = self.position
-        self.position = (self.position + total_steps) % len(self.board)
-
-        if self.position < prev_position:
-            print(f"{self.name} passed Go and collects £200!")
-            self.money += 200
+        total = self.position + total_steps
+        laps = total // self._n_tiles
+        self.position = total - laps * self._n_tiles
+        self.money += 200 * laps
+        if laps and self._verbose: print(f"{self.name} passed Go and collects £200!")
 
-        print(f"{self.name} lands on {self.board[self.position]}")
+        if self._verbose: print(f"{self.name} lands on {board[self.position]}")
         self.handle_tile()
 
-
-    def build_houses(self):
-        """Build houses on most expensive color sets, maintaining £150 minimum balance"""
-        MIN_RESERVE = 150
-        MAX_HOUSES_PER_TURN = 6
-        agent = getattr(self.game, "agent", None)
-        if agent is not None:
-    # prepare candidate_props: dict colour -> [prop,...] for full sets
-          candidate_props = {}
-          for prop in self.properties:
-            if prop.buildable and not prop.mortgaged and self._owns_full_colour_set(prop.colour):
-              candidate_props.setdefault(prop.colour, []).append(prop)
-          if candidate_props:
-             build_suggestions = agent.suggest_build(self, candidate_props, self.game)
-             print("AGENT BUILD SUGGESTIONS:")
-             for s in build_suggestions[:3]:
-              print(f"  - {s.get('colour','?')}: {s.get('reason')}")
-        
-        # Check if player can afford to build
-        if self.money <= MIN_RESERVE:
-            print(f"{self.name} can't build - needs minimum £{MIN_RESERVE} reserve")
-            return
-
-        # 1. Identify complete, buildable color sets
-        color_sets = defaultdict(list)
-        for prop in self.properties:
-            if (prop.buildable and not prop.mortgaged 
-                and self._owns_full_colour_set(prop.colour)):
-                color_sets[prop.colour].append(prop)
-        
-        if not color_sets:
-            print(f"{self.name} has no complete color sets to build on")
-            return
-
-        # 2. Sort sets by most expensive first (Dark Blue £200 -> Brown £50)
-        build_order = sorted(color_sets.keys(),
-                           key=lambda c: -color_sets[c][0].house_price)
-        
-        total_built = 0
-        for color in build_order:
-            if total_built >= MAX_HOUSES_PER_TURN:
-                break
-                
-            props = color_sets[color]
-            house_price = props[0].house_price
-            available_houses = min(
-                MAX_HOUSES_PER_TURN - total_built,
-                (self.money - MIN_RESERVE) // house_price
-            )
-            
-            if available_houses < 1:
-                continue
-                
-            print(f"\nBuilding on {color} set (£{house_price}/house)...")
-            
-            # 3. Build houses with even distribution
-            houses_built = 0
-            while (houses_built < available_houses 
-                   and self.money >= MIN_RESERVE + house_price):
-                
-                # Find buildable property with fewest houses
-                buildable_props = [p for p in props 
-                                 if p.can_build_house() or p.can_build_hotel()]
-                if not buildable_props:
-                    break
-                    
-                target = min(buildable_props,
-                            key=lambda p: p.houses if not p.hotel else float('inf'))
-                
-                # Prefer hotel conversion if possible
-                if target.can_build_hotel():
-                    target.add_hotel()
-                    self.money -= house_price
-                    houses_built += 1
-                    total_built += 1
-                    print(f"  Converted to HOTEL on {target.name} (£{house_price})")
-                elif target.add_house():
-                    self.money -= house_price
-                    houses_built += 1
-                    total_built += 1
-                    print(f"  Added house on {target.name} (now {target.houses}) £{house_price}")
-                else:
-                    break
-        
-        if total_built > 0:
-            print(f"\n{self.name} built {total_built} houses/hotels")
-            print(f"Remaining balance: £{self.money}")
-        else:
-            print(f"{self.name} couldn't build while maintaining £{MIN_RESERVE} reserve")
     def sell_houses(self, target_amount=0):
         """Sell houses/hotels incrementally to raise specific amount"""
         SELL_RATIO = 0.5  # Houses sell for half price
         total_raised = 0
         
         # Sort properties by most expensive first (will sell these first)
-        sellable_props = sorted(
-            [p for p in self.properties if p.houses > 0 or p.hotel],
-            key=lambda p: -p.house_price
-        )
+        sellable_props = [p for p in self._sorted_props_desc()
+                          if p.houses > 0 or p.hotel]
 
         for prop in sellable_props:
             while ((target_amount == 0 or total_raised < target_amount) 
@@ -581,14 +844,18 @@ class Player:
                     # Convert hotel to 4 houses first
                     prop.hotel = False
                     prop.houses = 4
-                    print(f"Converted hotel to 4 houses on {prop.name}")
+                    if self._verbose: print(f"Converted hotel to 4 houses on {prop.name}")
                     continue
                     
                 # Sell one house at a time
                 prop.houses -= 1
+                self._total_expected_rent_cache = None
                 self.money += sell_value
                 total_raised += sell_value
-                print(f"Sold 1 house on {prop.name} for £{sell_value} "
+                if prop.houses == 0:
+                    self._push_mortgageable(prop)  # eligible again once bare
+                    self._plain_props[prop] = None
+                if self._verbose: print(f"Sold 1 house on {prop.name} for £{sell_value} "
                       f"(now {prop.houses} houses)")
                 
                 # Immediate balance update check
@@ -597,18 +864,25 @@ class Player:
         
         return total_raised
 
-    def build_houses(self, colour = None):
-        """Smart building with selling and fund reallocation"""
+    def build_houses(self, colour=None, max_houses=None, group=None):
+        """Smart building with selling and fund reallocation.
+
+        `max_houses` caps the builds performed in one call (the per-turn
+        limit the removed duplicate definition used to enforce). Callers
+        that already hold the colour group from get_candidate_builds can
+        pass it as `group` to skip re-deriving it."""
         MIN_RESERVE = 150
         BUILD_BUFFER = 50  # Extra cushion for building
         
-        # 1. Check cheapest available build options
+        # 1. Check cheapest available build options (single grouping pass)
         buildable_sets = defaultdict(list)
-        for prop in self.properties:
-            if (prop.buildable and not prop.mortgaged 
-                and self._owns_full_colour_set(prop.colour)):
-                if colour is None or prop.colour == colour:
-                    buildable_sets[prop.house_price].append(prop)
+        if group is not None and colour is not None:
+            if all(p.buildable and not p.mortgaged for p in group):
+                buildable_sets[group[0].house_price].extend(group)
+        else:
+            for c, g in self._complete_buildable_sets().items():
+                if colour is None or c == colour:
+                    buildable_sets[g[0].house_price].extend(g)
         
         if not buildable_sets:
             return False
@@ -618,9 +892,18 @@ class Player:
         
         # 2. Try building normally first
         built_count = 0
-        while self.money >= MIN_RESERVE + cheapest_price + BUILD_BUFFER:
-            target = min(cheapest_props, 
-                        key=lambda p: p.houses if not p.hotel else float('inf'))
+        while (self.money >= MIN_RESERVE + cheapest_price + BUILD_BUFFER
+               and (max_houses is None or built_count < max_houses)):
+            # Even-building rule: always add to the least-developed property.
+            # A plain loop over the (<= 3-strong) group beats min()+lambda,
+            # which pays a Python call per candidate per house built.
+            target = None
+            lowest = 6
+            for p in cheapest_props:
+                level = 5 if p.hotel else p.houses
+                if level < lowest:
+                    lowest = level
+                    target = p
             
             if target.hotel:
                 break
@@ -628,13 +911,17 @@ class Player:
             if target.houses == 4 and target.can_build_hotel():
                 if self.money >= MIN_RESERVE + cheapest_price:
                     target.add_hotel()
+                    self._plain_props.pop(target, None)
+                    self._total_expected_rent_cache = None
                     self.money -= cheapest_price
                     built_count += 1
-                    print(f"Built hotel on {target.name}")
+                    if self._verbose: print(f"Built hotel on {target.name}")
             elif target.add_house():
+                self._plain_props.pop(target, None)
+                self._total_expected_rent_cache = None
                 self.money -= cheapest_price
                 built_count += 1
-                print(f"Built house on {target.name} (now {target.houses})")
+                if self._verbose: print(f"Built house on {target.name} (now {target.houses})")
             else:
                 break
         
@@ -642,16 +929,14 @@ class Player:
             return True
             
         # 3. If couldn't build, try selling expensive to fund cheap builds
-        if (self.money < MIN_RESERVE + cheapest_price and random.random() < 0.1):
-            print("Considering selling houses to fund building ...")
+        if (self.money < MIN_RESERVE + cheapest_price and self._next_rnd() < 0.1):
+            if self._verbose: print("Considering selling houses to fund building ...")
             needed = max(cheapest_price, 
                         (MIN_RESERVE + cheapest_price) - self.money)
           
             # Sell from most expensive properties first
-            expensive_props = sorted(
-                [p for p in self.properties if p.houses > 0 or p.hotel],
-                key=lambda p: -p.house_price
-            )
+            expensive_props = [p for p in self._sorted_props_desc()
+                               if p.houses > 0 or p.hotel]
             
             for prop in expensive_props:
                 if self.money >= MIN_RESERVE + cheapest_price:
@@ -665,78 +950,117 @@ class Player:
                     if prop.hotel:
                         prop.hotel = False
                         prop.houses = 4
-                        print(f"Converted hotel to 4 houses on {prop.name}")
+                        if self._verbose: print(f"Converted hotel to 4 houses on {prop.name}")
                         continue
                         
                     prop.houses -= 1
                     self.money += sell_value
-                    print(f"Sold 1 house from {prop.name} (+£{sell_value})")
+                    if self._verbose: print(f"Sold 1 house from {prop.name} (+£{sell_value})")
                     
                     # Immediately try building with new funds
                     if self.money >= MIN_RESERVE + cheapest_price:
                         return self.build_houses()  # Recursively retry
-        
+
         return False
-        
+
+    def plan_builds(self, group, target_level):
+        """Level a whole completed colour group to target_level in one step.
+
+        Batch alternative to the incremental build_houses loop for callers
+        that already decided a target (level 5 = hotel): the shortfall and
+        total cost are computed once, the cash reserve is checked once, and
+        the levels are written in a single pass with one money deduction
+        instead of a per-house check-build-deduct round trip.
+        """
+        MIN_RESERVE = 150
+        target = min(int(target_level), 5)
+        if target <= 0 or not group:
+            return False
+        needed = 0
+        for p in group:
+            if not p.buildable or p.mortgaged:
+                return False
+            level = 5 if p.hotel else p.houses
+            needed += max(0, target - level)
+        if needed == 0:
+            return False
+        cost = needed * group[0].house_price
+        if self.money < MIN_RESERVE + cost:
+            return False
+        for p in group:
+            level = 5 if p.hotel else p.houses
+            if level >= target:
+                continue
+            if target == 5:
+                p.houses = 0
+                p.hotel = True
+            else:
+                p.houses = target
+            self._plain_props.pop(p, None)
+        self.money -= cost
+        self._total_expected_rent_cache = None
+        if self._verbose:
+            print(f"{self.name} built {needed} house(s) on the {group[0].colour} set in one plan")
+        return True
+
     def ensure_non_negative_balance(self):
         """Handle bankruptcy with proper asset valuation"""
         original_balance = self.money
         
         # 1. Try selling houses/hotels first
         if self.money < 0:
-            print(f"\n🚨 {self.name} has negative balance (£{self.money}) - attempting recovery...")
+            if self._verbose: print(f"\n🚨 {self.name} has negative balance (£{self.money}) - attempting recovery...")
             houses_sold = self.sell_houses(target_amount=abs(self.money))
             if houses_sold > 0:
-                print(f"Sold buildings to raise £{houses_sold}")
+                if self._verbose: print(f"Sold buildings to raise £{houses_sold}")
                 if self.money >= 0:
                     return True
 
-        # 2. Try mortgaging properties
+        # 2. Try mortgaging properties, most valuable first; stale heap
+        # entries (built-on or transferred since pushed) are dropped on pop.
         mortgaged_props = []
-        for prop in self.properties:
-            if self.money >= 0:
-                break
-            if not prop.mortgaged and prop.houses == 0 and not prop.hotel:
-                if self.mortgage_property(prop):
-                    mortgaged_props.append(prop.name)
-                    print(f"Mortgaged {prop.name} for £{prop.mortgage_value}")
+        heap = self._mortgageable_heap
+        while self.money < 0 and heap:
+            _, _, prop = heapq.heappop(heap)
+            if prop.owner is not self or not prop.can_mortgage():
+                continue
+            if self.mortgage_property(prop):
+                mortgaged_props.append(prop.name)
+                if self._verbose: print(f"Mortgaged {prop.name} for £{prop.mortgage_value}")
 
         # 3. Final bankruptcy check
         if self.money < 0:
-            print(f"\n💀 {self.name} is BANKRUPT! (Balance: £{self.money}) 💀")
+            if self._verbose: print(f"\n💀 {self.name} is BANKRUPT! (Balance: £{self.money}) 💀")
             self.declare_bankrupt()
             return False
         
         if original_balance != self.money:
-            print(f"{self.name}'s new balance: £{self.money}")
+            if self._verbose: print(f"{self.name}'s new balance: £{self.money}")
         return True
 
     def declare_bankrupt(self):
         """Handle player bankruptcy and determine winner"""
-        print("\n⚖️ Calculating final standings...")
+        if self._verbose: print("\n⚖️ Calculating final standings...")
         
-        # Calculate all players' net worth
+        # Calculate all players' net worth in one vectorized board pass
         leaderboard = []
-        for player in self.game.players:
+        worths = _net_worths(self.game.players)
+        for player, net_worth in zip(self.game.players, worths):
             if player != self and player.money >= 0:  # Skip bankrupt players
-                net_worth = self.calculate_net_worth(player)
                 leaderboard.append((player, net_worth))
-                print(f"  {player.name}: £{net_worth} total worth")
+                if self._verbose: print(f"  {player.name}: £{net_worth} total worth")
 
         if not leaderboard:
-            print("All players bankrupt - no winner!")
-            exit()
+            if self._verbose: print("All players bankrupt - no winner!")
+            return
 
-        # Sort by net worth descending
-        leaderboard.sort(key=lambda x: -x[1])
-        winner = leaderboard[0][0]
-        winner_worth = leaderboard[0][1]
+        # Only the top entry is needed: max() is O(N) vs sorting everyone
+        winner, winner_worth = max(leaderboard, key=lambda x: x[1])
 
-        print(f"\n🏆 {winner.name} WINS!")
-        print(f"  Cash: £{winner.money}")
-        print(f"  Property value: £{winner_worth-winner.money}")
-        print(f"  Total net worth: £{winner_worth}")
-        exit()
+        if self._verbose: print(f"\n🏆 {winner.name} WINS!")
+        if self._verbose: print(f"  Cash: £{winner.money}")
+        if self._verbose: print(f"  Property value: £{winner_worth-winner.money}")
+        if self._verbose: print(f"  Total net worth: £{winner_worth}")
 
     def calculate_net_worth(self, player):
         """Calculate player's total net worth including assets"""
@@ -758,80 +1082,86 @@ class Player:
         return total
 
     def handle_tile(self):
-        tile = self.board[self.position]
-        if isinstance(tile, Property):
-            if tile.owner is None:
-                agent = getattr(self.game, "agent", None)
-                suggestion = None
-                if agent:
-                    suggestion = agent.suggest_buy(self, tile, self.game)
-                    print(f"AGENT SUGGESTION — Buy {tile.name}? -> {suggestion['action'].upper()} (score={suggestion.get('score',0):.2f}) — {suggestion.get('reason')}")
-                if self.human:
-                    choice = input(f"Do you want to buy {tile.name} for £{tile.price}? (yes/no) ").lower()
-                    if choice in ['yes', 'y']:
-                        self.buy_property(tile)
-                    else:
-                        self.auction_property(tile)
+        pos = self.position  # read once; handlers may move the player
+        self._TILE_HANDLERS[self._tile_kinds[pos]](self, self.board[pos])
+
+    def _handle_plain_tile(self, tile):
+        pass
+
+    def _handle_property_tile(self, tile):
+        if tile.owner is None:
+            agent = self.game.agent
+            suggestion = None
+            if agent:
+                suggestion = agent.suggest_buy(self, tile, self.game)
+                if self._verbose: print(f"AGENT SUGGESTION — Buy {tile.name}? -> {suggestion['action'].upper()} (score={suggestion.get('score',0):.2f}) — {suggestion.get('reason')}")
+            if self.human:
+                choice = self._input(f"Do you want to buy {tile.name} for £{tile.price}? (yes/no) ").lower()
+                if choice in ['yes', 'y']:
+                    self.buy_property(tile)
                 else:
-                    if suggestion and suggestion['action'] == 'buy':
-                        self.buy_property(tile)
-                    else:
-                        self.auction_property(tile)
-            elif tile.owner != self:
-                roll_dice = self.last_roll_total if tile.colour == "Utility" else None
-                owns_full_set = tile.owner._owns_full_colour_set(tile.colour)
-                rent = tile.calculate_rent(owns_full_colour_set=owns_full_set, roll_dice=roll_dice)
-                print(f"{self.name} pays £{rent} rent to {tile.owner.name}")
-                self.money -= rent
-                tile.owner.money += rent
-                self.ensure_non_negative_balance()
+                    self.auction_property(tile)
             else:
-                print(f"{self.name} owns this property")
-        elif tile in ["Chance", "Community Chest"]:
-            self.draw_card(tile)
-        elif tile == "Go To Jail":
-            self.go_to_jail()
-        elif tile == "Income Tax":
-            self.money -= 200
-            print(f"Paid £200 Income Tax. Balance: £{self.money}")
-            self.ensure_non_negative_balance()
-        elif tile == "Super Tax":
-            self.money -= 100
-            print(f"Paid £100 Super Tax. Balance: £{self.money}")
+                if suggestion and suggestion['action'] == 'buy':
+                    self.buy_property(tile)
+                else:
+                    self.auction_property(tile)
+        elif tile.owner != self:
+            roll_dice = self.last_roll_total if tile._kind == _KIND_UTILITY else None
+            owns_full_set = tile.owner._owns_full_colour_set(tile.colour)
+            rent = tile.calculate_rent(owns_full_colour_set=owns_full_set, roll_dice=roll_dice)
+            if self._verbose: print(f"{self.name} pays £{rent} rent to {tile.owner.name}")
+            self.money -= rent
+            tile.owner.money += rent
             self.ensure_non_negative_balance()
+        else:
+            if self._verbose: print(f"{self.name} owns this property")
 
-            
+    def _handle_card_tile(self, tile):
+        self.draw_card(tile)
+
+    def _handle_go_to_jail_tile(self, tile):
+        self.go_to_jail()
+
+    def _handle_income_tax_tile(self, tile):
+        self.money -= 200
+        if self._verbose: print(f"Paid £200 Income Tax. Balance: £{self.money}")
+        self.ensure_non_negative_balance()
+
+    def _handle_super_tax_tile(self, tile):
+        self.money -= 100
+        if self._verbose: print(f"Paid £100 Super Tax. Balance: £{self.money}")
+        self.ensure_non_negative_balance()
+
+    # Indexed by the KIND_* codes from Monopoly.board.
+    _TILE_HANDLERS = (_handle_plain_tile, _handle_property_tile,
+                      _handle_card_tile, _handle_go_to_jail_tile,
+                      _handle_income_tax_tile, _handle_super_tax_tile)
+
+    
     def draw_card(self, deck_type):
         """Draw a Chance or Community Chest card (simplified)"""
-        card = random.choice([
-            ("Bank error in your favor, gain £200", 200),
-            ("Doctor's fees, lose £50", -50),
-            ("From sale of stock, gain £50", 50),
-            ("Go to Jail", "jail"),
-            ("Grand Opera Night, pay £100", -100),
-            ("Income tax refund, gain £20", 20)
-        ])
+        card = _CARDS[int(self._next_rnd() * len(_CARDS))]
         
-        print(f"{deck_type} Card: {card[0]}")
+        if self._verbose: print(f"{deck_type} Card: {card[0]}")
         
-        if card[1] == "jail":
+        amount = card[1]
+        if amount is _JAIL:
             self.go_to_jail()
         else:
-            self.money += card[1]
-            print(f"New balance: £{self.money}")
+            self.money += amount
+            if self._verbose: print(f"New balance: £{self.money}")
             if self.money < 0:
                 if not self.ensure_non_negative_balance():
                     return
 
     def __str__(self):
-        pos_name = self.board[self.position].name if isinstance(self.board[self.position], Property) else self.board[self.position]
+        tile = self.board[self.position]
+        pos_name = tile.name if isinstance(tile, Property) else tile
         return (f"{self.name} (£{self.money}) at {pos_name} | Properties: {len(self.properties)}")
     
 
     def get_candidate_builds(self):
-        candidate = {}
-        for colour in set(p.colour for p in self.properties):
-          if self._owns_full_colour_set(colour):
-            props_in_colour = [p for p in self.properties if p.colour == colour]
-            candidate[colour] = props_in_colour
-        return candidate
\ No newline at end of file
+        full_sets = self._full_sets
+        return {colour: list(self._props_by_colour[colour])
+                for colour, bit in COLOUR_BITS.items() if full_sets & bit}
\ No newline at end of file
@@ -1,4 +1,73 @@
+import sys
+
+import numpy as np
+
+# Optional numba, same pattern as Markovchain: the rent arithmetic
+# compiles to a branchy-but-tiny native function when available.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Tile-kind codes for the rent kernel.
+_KIND_STREET, _KIND_STATION, _KIND_UTILITY = 0, 1, 2
+
+# Interned colour-group names compared in hot paths: identity hits the
+# PyUnicode_Compare short-circuit instead of a character compare.
+_STATION = sys.intern("Station")
+_UTILITY = sys.intern("Utility")
+
+_STATION_RENTS = np.array([25, 50, 100, 200], dtype=np.int64)
+
+
+def _rent_kernel(kind, houses, hotel, full_set, owned_in_group, roll, rent_levels, base_rent):
+    """Pure-integer rent computation shared by calculate_rent/expected_rent.
+
+    Numeric arguments only (rent_levels is an int64 array) so the body is
+    numba-compilable; decorated below when numba is available.
+    """
+    if kind == _KIND_UTILITY:
+        multiplier = 4 if owned_in_group == 1 else 10
+        return roll * multiplier
+    if kind == _KIND_STATION:
+        return _STATION_RENTS[owned_in_group - 1]
+    if hotel:
+        return rent_levels[5]
+    if houses > 0:
+        return rent_levels[houses]
+    base = rent_levels[0]
+    return base * 2 if full_set else base
+
+
+if njit is not None:
+    _rent_kernel = njit(cache=True)(_rent_kernel)
+
+
 class Property:
+    # No per-instance __dict__: forty of these sit on the board and their
+    # attributes (houses, colour, owner, ...) are read in every rent and
+    # build decision, so slot storage saves a dict lookup per access.
+    __slots__ = ('name', 'price', 'base_rent', 'colour', 'house_price',
+                 'buildable', 'owner', 'houses', 'hotel', 'mortgaged',
+                 'rent_levels', '_rent_cache', '_kind', '_rent_arr',
+                 '_rent_state_table', 'mortgage_value')
+
+    # Number of properties in each colour group on the standard board —
+    # the single source for monopoly checks everywhere (board.COLOUR_TOTALS
+    # aliases this).
+    COLOUR_GROUP_SIZE = {
+        "Brown": 2,
+        "Light Blue": 3,
+        "Pink": 3,
+        "Orange": 3,
+        "Red": 3,
+        "Yellow": 3,
+        "Green": 3,
+        "Dark Blue": 2,
+        "Station": 4,
+        "Utility": 2
+    }
+
     house_price_map = {
         "Brown": 50,
         "Light Blue": 50,
@@ -15,45 +84,64 @@ class Property:
     def __init__(self, name, price, base_rent, colour, rent_levels=None):
         self.name = name
         self.price = price
+        # price never changes post-construction, so the mortgage value is
+        # a precomputed attribute rather than a recomputing property.
+        self.mortgage_value = price // 2
         self.base_rent = base_rent
-        self.colour = colour
+        self.colour = sys.intern(colour)
+        colour = self.colour
         self.house_price = self.house_price_map.get(colour, 0)
-        self.buildable = colour not in ["Station", "Utility"]
+        self.buildable = colour is not _STATION and colour is not _UTILITY
         self.owner = None
         self.houses = 0  # 0–4 houses
         self.hotel = False  # Replaces 4 houses
         self.mortgaged = False
         # rent_levels format: [no houses, 1h, 2h, 3h, 4h, hotel]
-        self.rent_levels = rent_levels if rent_levels else []
+        self.rent_levels = tuple(rent_levels) if rent_levels else ()
+        # Memoized rent values keyed by everything the rent depends on
+        # (house level, monopoly flag, owner's station/utility count, ...),
+        # so repeated training-loop queries collapse to one dict lookup.
+        self._rent_cache = {}
+        # Numeric mirrors of the rent inputs for the compiled kernel.
+        self._kind = (_KIND_UTILITY if colour is _UTILITY
+                      else _KIND_STATION if colour is _STATION
+                      else _KIND_STREET)
+        # Always six entries — the base_rent multiples stand in when no
+        # explicit ladder is given — so the kernel indexes unconditionally.
+        table = self.rent_levels or (base_rent, base_rent * 2, base_rent * 3,
+                                     base_rent * 4, base_rent * 5, base_rent * 10)
+        self._rent_arr = np.asarray(table, dtype=np.int64)
+        # Street rent enumerated over its whole 7-state space —
+        # (base, doubled base, 1-4 houses, hotel) — so calculate_rent is a
+        # single index instead of branch-plus-multiply.
+        self._rent_state_table = (table[0], table[0] * 2, table[1], table[2],
+                                  table[3], table[4], table[5])
 
     def calculate_rent(self, owns_full_colour_set=False, roll_dice=None):
         """Calculate rent with strict Monopoly rules."""
         if self.mortgaged or not self.owner:
             return 0
 
-        # Utilities
-        if self.colour == "Utility":
+        # Utilities need the live roll; stations only their owned count.
+        if self._kind == _KIND_UTILITY:
             if roll_dice is None:
                 return 0
-            owned_utils = sum(1 for p in self.owner.properties if p.colour == "Utility")
-            multiplier = 4 if owned_utils == 1 else 10
-            return roll_dice * multiplier
-
-        # Stations
-        if self.colour == "Station":
-            owned_stations = sum(1 for p in self.owner.properties if p.colour == "Station")
-            return [25, 50, 100, 200][owned_stations - 1]
-
-            # Street properties
+            return int(_rent_kernel(self._kind, 0, False, False,
+                                    self.owner._colour_counts.get("Utility", 0),
+                                    roll_dice, self._rent_arr, self.base_rent))
+        if self._kind == _KIND_STATION:
+            return int(_rent_kernel(self._kind, 0, False, False,
+                                    self.owner._colour_counts.get("Station", 0),
+                                    0, self._rent_arr, self.base_rent))
+
+        # Street properties: one table index over the enumerated state space
         if self.hotel:
-         return self.rent_levels[-1] if self.rent_levels else self.base_rent * 10
-    
-        if self.houses > 0:
-         return self.rent_levels[self.houses] if self.rent_levels else self.base_rent * (self.houses + 1)
-    
-         # Base rent (only case where doubling applies)
-        base_rent = self.rent_levels[0] if self.rent_levels else self.base_rent
-        return base_rent * (2 if owns_full_colour_set else 1)
+            state = 6
+        elif self.houses:
+            state = self.houses + 1
+        else:
+            state = 1 if owns_full_colour_set else 0
+        return self._rent_state_table[state]
 
     # --- Property Management Methods ---
     def can_build_house(self):
@@ -103,10 +191,6 @@ class Property:
         return int(self.mortgage_value * 1.1)
 
     # --- Property Information ---
-    @property
-    def mortgage_value(self):
-        return self.price // 2
-
     def __str__(self):
         status = []
         if self.mortgaged:
@@ -134,23 +218,30 @@ class Property:
         """Return expected rent per-visit, scaled by landing probability p_land (0..1)."""
         if self.mortgaged or self.owner is None:
             return 0.0
-        if self.colour == "Utility":
-            owned_utils = sum(1 for p in self.owner.properties if p.colour == "Utility")
-            multiplier = 4 if owned_utils == 1 else 10
-            rent = expected_roll * multiplier
-            return p_land * rent
-        if self.colour == "Station":
-            owned = sum(1 for p in self.owner.properties if p.colour == "Station")
-            rent = [25, 50, 100, 200][max(0, owned - 1)]
-            return p_land * rent
-        if self.hotel:
-            rent = self.rent_levels[-1] if self.rent_levels else self.base_rent * 10
-        elif self.houses > 0:
-            rent = self.rent_levels[self.houses] if self.rent_levels else self.base_rent * (self.houses + 1)
+        if self._kind == _KIND_UTILITY:
+            key = ("eu", p_land, expected_roll, self.owner._colour_counts.get(_UTILITY, 0))
+        elif self._kind == _KIND_STATION:
+            key = ("es", p_land, self.owner._colour_counts.get(_STATION, 0))
+        else:
+            key = ("e", p_land, owns_full_colour_set, self.houses, self.hotel)
+        cached = self._rent_cache.get(key)
+        if cached is not None:
+            return cached
+        if self._kind == _KIND_UTILITY:
+            rent = _rent_kernel(self._kind, 0, False, False,
+                                self.owner._colour_counts.get("Utility", 0),
+                                expected_roll, self._rent_arr, self.base_rent)
+        elif self._kind == _KIND_STATION:
+            rent = _rent_kernel(self._kind, 0, False, False,
+                                max(1, self.owner._colour_counts.get("Station", 0)),
+                                0, self._rent_arr, self.base_rent)
         else:
-            base = self.rent_levels[0] if self.rent_levels else self.base_rent
-            rent = base * (2 if owns_full_colour_set else 1)
-        return p_land * rent
+            rent = _rent_kernel(self._kind, self.houses, self.hotel,
+                                owns_full_colour_set, 0, 0,
+                                self._rent_arr, self.base_rent)
+        value = p_land * rent
+        self._rent_cache[key] = value
+        return value
 
     def build_cost(self):
         return self.house_price if self.buildable else None
@@ -1,5 +1,6 @@
 # Monopoly/train_agent.py
 
+import multiprocessing
 import random
 from Monopoly.player import Player
 from Monopoly.board import tiles
@@ -8,150 +9,167 @@ from Monopoly.property import Property  # Ensure same Property class is imported
 
 NUM_EPISODES = 2000  # Increase for better learning
 MAX_TURNS = 50       # Max turns per game
+NUM_WORKERS = max(1, multiprocessing.cpu_count() - 1)
+
+# Per-worker exploration agent, built once per process by _init_worker so
+# run_episode doesn't construct Q-tables per episode. Workers only select
+# actions; all learning happens in the parent.
+_worker_agent = None
+
+
+def _init_worker():
+    global _worker_agent
+    _worker_agent = QLearningAgent(epsilon=0.2)
+
+
+def _group_expected_rent(player, colour):
+    """Expected rent over one colour group only.
+
+    Buying or building touches a single group, so rewards diff this
+    O(group) sum instead of sweeping the whole portfolio — every other
+    property's expected rent is unchanged and cancels in the delta.
+    """
+    full_set = player._owns_full_colour_set(colour)
+    return sum(
+        p.expected_rent(p_land=0.05, owns_full_colour_set=full_set)
+        for p in player._props_by_colour[colour]
+    )
+
+
+def run_episode(seed):
+    """Play one self-contained training episode.
+
+    Episodes are independent games, so they parallelize across processes;
+    only the Q-table updates need a single writer. Returns a list of
+    (records, final_reward) pairs, one per player, for the parent process
+    to fold into its Q-tables.
+    """
+    random.seed(seed)  # reproducible per episode regardless of worker
+    Player.seed_rng(seed)  # ...including the shared dice/decision stream
+    agent = _worker_agent if _worker_agent is not None else QLearningAgent(epsilon=0.2)
+
+    # Initialize AI players only
+    players = [
+        Player("Ashiya", tiles),
+        Player("Ajay", tiles),
+        Player("Arsh", tiles)
+    ]
+
+    # Minimal game stub
+    class GameStub:
+        def __init__(self, players):
+            self.players = players
+            self.board = tiles
+            self.agent = None  # player.move() reads game.agent directly
+            self.verbose = False  # silence per-turn narration during training
+
+    game = GameStub(players)
+    for player in players:
+        player.game = game
+
+    # Track episode records per player
+    player_records = {p.name: [] for p in players}
+
+    for turn in range(1, MAX_TURNS + 1):
+        for player in players:
+            # --- Move ---
+            player.move()
+
+            # --- Buy property if applicable ---
+            if hasattr(player, 'current_property') and isinstance(player.current_property, Property):
+                prop = player.current_property
+
+                # Record previous state: only prop's colour group can change
+                prev_net_worth = player.net_worth()
+                prev_expected_rent = _group_expected_rent(player, prop.colour)
+
+                # AI decision
+                state_buy = agent._state_buy(player, prop, game)
+                action_buy = agent.select_action(player, "buy", state_buy)
+
+                if action_buy == 1 and player.money >= prop.price:
+                    player.buy_property(prop)
+                # else: skip (auction handled elsewhere)
+
+                # Calculate reward
+                new_net_worth = player.net_worth()
+                new_expected_rent = _group_expected_rent(player, prop.colour)
+                reward = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
+                player_records[player.name].append(("buy", state_buy, action_buy, reward))
+
+                player.current_property = None
+
+            # --- Build houses/hotels ---
+            candidate_sets = player.get_candidate_builds()
+            build_actions = agent.suggest_build(player, candidate_sets, game)
+
+            for ba in build_actions:
+                # skip suggestions carry no "colour"; nothing changes, so
+                # their rent delta is zero
+                colour = ba.get("colour")
+                prev_net_worth = player.net_worth()
+                prev_expected_rent = _group_expected_rent(player, colour) if colour else 0
+
+                if ba["action"] == "build":
+                    player.build_houses(colour,
+                                        group=candidate_sets.get(colour))
+                    action_build = 1
+                else:
+                    action_build = 0
+
+                state_build = agent._state_build(player, ba.get("house_price", 0), game)
+
+                # Reward = delta net worth + delta expected rent
+                new_net_worth = player.net_worth()
+                new_expected_rent = _group_expected_rent(player, colour) if colour else 0
+
+                reward_build = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
+
+                player_records[player.name].append(("build", state_build, action_build, reward_build))
+
+            # --- Trading logic ---
+            traded = player.attempt_trade()
+            if traded:
+                prev_net_worth = player.net_worth()
+                prev_expected_rent = player.total_expected_rent()
+
+
+                new_net_worth = player.net_worth()
+                new_expected_rent = player.total_expected_rent()
+                reward_trade = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
+
+                state_trade = agent._state_trade(player, game)
+                player_records[player.name].append(("trade", state_trade, 1, reward_trade))
+
+    # --- End of episode: collect per-player results ---
+    results = []
+    for p in players:
+        final_net_worth = p.net_worth()
+        final_expected_rent = p.total_expected_rent()
+
+        final_reward = final_net_worth + final_expected_rent
+        results.append((player_records[p.name], final_reward))
+    return results
+
 
 def train_q_agent_realistic():
-    agent = QLearningAgent(epsilon=0.2)  # exploration
-
-    for episode in range(1, NUM_EPISODES + 1):
-        # Initialize AI players only
-        players = [
-            Player("Ashiya", tiles),
-            Player("Ajay", tiles),
-            Player("Arsh", tiles)
-        ]
-
-        # Minimal game stub
-        class GameStub:
-            def __init__(self, players):
-                self.players = players
-                self.board = tiles
-
-        game = GameStub(players)
-        for player in players:
-            player.game = game
-
-        # Track episode records per player
-        player_records = {p.name: [] for p in players}
-
-        for turn in range(1, MAX_TURNS + 1):
-            for player in players:
-                # --- Move ---
-                player.move()
-
-                # --- Buy property if applicable ---
-                if hasattr(player, 'current_property') and isinstance(player.current_property, Property):
-                    prop = player.current_property
-
-                    # Record previous state
-                    prev_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    prev_expected_rent = sum(
-                        p.expected_rent(p_land=0.05) for p in player.properties if isinstance(p, Property)
-                    )
-
-                    # AI decision
-                    state_buy = agent._state_buy(player, prop, game)
-                    action_buy = agent.select_action(player, "buy", state_buy)
-
-                    if action_buy == 1 and player.money >= prop.price:
-                        player.buy_property(prop)
-                    # else: skip (auction handled elsewhere)
-
-                    # Calculate reward
-                    new_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    new_expected_rent = sum(
-                        p.expected_rent(p_land=0.05) for p in player.properties if isinstance(p, Property)
-                    )
-                    reward = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
-                    player_records[player.name].append(("buy", state_buy, action_buy, reward))
-
-                    player.current_property = None
-
-                # --- Build houses/hotels ---
-                candidate_sets = player.get_candidate_builds()
-                build_actions = agent.suggest_build(player, candidate_sets, game)
-
-                for ba in build_actions:
-                    prev_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    prev_expected_rent = sum(
-                       p.expected_rent(p_land=0.05, owns_full_colour_set=player.owns_full_set(p.colour)) 
-                       for p in player.properties 
-                       if isinstance(p, Property) and hasattr(p, 'expected_rent')
-                     )
-
-                    if ba["action"] == "build":
-                        player.build_houses(ba["colour"])
-                        action_build = 1
-                    else:
-                        action_build = 0
-
-                    state_build = agent._state_build(player, ba.get("house_price", 0), game)
-
-                    # Reward = delta net worth + delta expected rent
-                    new_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    new_expected_rent = sum(
-                      p.expected_rent(p_land=0.05, owns_full_colour_set=player.owns_full_set(p.colour)) 
-                      for p in player.properties 
-                      if isinstance(p, Property) and hasattr(p, 'expected_rent')
-                    )
-
-                    reward_build = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
-
-                    player_records[player.name].append(("build", state_build, action_build, reward_build))
-
-                # --- Trading logic ---
-                traded = player.attempt_trade()
-                if traded:
-                    prev_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    prev_expected_rent = sum(
-                      p.expected_rent(p_land=0.05, owns_full_colour_set=player.owns_full_set(p.colour)) 
-                      for p in player.properties 
-                      if isinstance(p, Property) and hasattr(p, 'expected_rent')
-                    )
-                    
-
-                    new_net_worth = player.money + sum(
-                        p.price for p in player.properties if isinstance(p, Property)
-                    )
-                    new_expected_rent =sum(
-                          p.expected_rent(p_land=0.05, owns_full_colour_set=player.owns_full_set(p.colour)) 
-                          for p in player.properties 
-                          if isinstance(p, Property) and hasattr(p, 'expected_rent')
-                        )
-                    reward_trade = (new_net_worth - prev_net_worth) + (new_expected_rent - prev_expected_rent)
-
-                    state_trade = agent._state_trade(player, game)
-                    player_records[player.name].append(("trade", state_trade, 1, reward_trade))
-
-        # --- End of episode: update Q-tables ---
-        for p in players:
-            final_net_worth = p.money + sum(
-                prop.price for prop in p.properties if isinstance(prop, Property)
-            )
-            final_expected_rent = sum(
-              p.expected_rent(p_land=0.05, owns_full_colour_set=player.owns_full_set(p.colour)) 
-              for p in player.properties 
-              if isinstance(p, Property) and hasattr(p, 'expected_rent')
-             )
-
-            final_reward = final_net_worth + final_expected_rent
-            agent.update_episode(player_records[p.name], final_reward)
-
-        if episode % 100 == 0:
-            print(f"Episode {episode}/{NUM_EPISODES} completed.")
+    agent = QLearningAgent(epsilon=0.2)
+
+    # Episodes are independent: fan them out across worker processes and
+    # keep Q-table writes single-writer by updating here as results arrive.
+    with multiprocessing.Pool(NUM_WORKERS, initializer=_init_worker) as pool:
+        completed = 0
+        for results in pool.imap_unordered(run_episode, range(NUM_EPISODES)):
+            for records, final_reward in results:
+                agent.update_episode(records, final_reward)
+            completed += 1
+            if completed % 100 == 0:
+                print(f"Episode {completed}/{NUM_EPISODES} completed.")
 
     # Save Q-tables
     agent.save("q_tables.pkl")
     print("Training complete. Q-tables saved to q_tables.pkl.")
 
 # Run training
-train_q_agent_realistic()
+if __name__ == "__main__":
+    train_q_agent_realistic()
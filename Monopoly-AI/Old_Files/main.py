@@ -55,24 +55,22 @@ for turn in range(1, 26):
                 if player.human:
                     print(f"🏷️ Auction started for {prop.name} (£{prop.price})")
                     current_bid = prop.price
-                    active_bidders = {p.name: p for p in players}
+                    # Passers drop out of the list directly, so each round
+                    # only touches players still in the auction.
+                    active_bidders = list(players)
                     last_bid = current_bid
-                    passed_players = set()
 
-                    while len(active_bidders) - len(passed_players) > 1:
-                        for p in list(active_bidders.values()):
-                            if p.name in passed_players:
-                                continue
+                    while len(active_bidders) > 1:
+                        for p in list(active_bidders):
                             bid = agent.suggest_bid(p, prop, game, last_bid)
                             print(f"{p.name} bids £{bid}" if bid > 0 else f"{p.name} passes")
                             if bid == 0:
-                                passed_players.add(p.name)
+                                active_bidders.remove(p)
                             else:
                                 last_bid = bid
 
-                    remaining = [p for p in active_bidders.values() if p.name not in passed_players]
-                    if remaining:
-                        winner = remaining[0]
+                    if active_bidders:
+                        winner = active_bidders[0]
                         winner.buy_property(prop)
                         print(f"🏆 {winner.name} wins the auction for {prop.name} at £{last_bid}. New balance: £{winner.money}")
 
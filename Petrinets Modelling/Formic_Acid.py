@@ -1,7 +1,21 @@
 # formic_petri_net.py
-from copy import deepcopy
+import sys
+from collections import defaultdict
+
+# Interned species names. Most are identifier-like and CPython interns
+# them anyway, but "HCOOH·Am" is not; sharing one object per species lets
+# string compares and dict probes short-circuit on identity.
+H2 = sys.intern("H2")
+CO2 = sys.intern("CO2")
+N2 = sys.intern("N2")
+AM = sys.intern("Am")
+HCOOH = sys.intern("HCOOH")
+HCOOH_AM = sys.intern("HCOOH·Am")
 
 class ColouredToken:
+    """External-facing token record; simulation state lives in Place.tokens."""
+    __slots__ = ('type', 'amount')
+
     def __init__(self, type, amount=1.0):
         self.type = type
         self.amount = amount
@@ -10,43 +24,46 @@ class ColouredToken:
         return f"{self.type}({self.amount})"
 
 class Place:
+    __slots__ = ('name', 'tokens')
+
     def __init__(self, name):
         self.name = name
-        self.tokens = []
+        # Structure-of-arrays marking: species -> total amount. Counting a
+        # species is one dict lookup and moving material is float
+        # arithmetic, instead of scanning/rebuilding a token-object list.
+        self.tokens = defaultdict(float)
 
     def add_tokens(self, tokens):
         if isinstance(tokens, list):
-            self.tokens.extend(tokens)
+            for t in tokens:
+                self.tokens[t.type] += t.amount
         else:
-            self.tokens.append(tokens)
+            self.tokens[tokens.type] += tokens.amount
 
     def remove_tokens(self, type=None, amount=None):
         """Simplified removal - remove all tokens of specific type or all tokens"""
         if type:
-            # Remove tokens of specific type
-            removed = [t for t in self.tokens if t.type == type]
-            self.tokens = [t for t in self.tokens if t.type != type]
-            if amount:
-                # If amount specified, only remove that amount
-                total_removed = sum(t.amount for t in removed)
-                if total_removed > amount:
-                    # Need to return some tokens
-                    remaining = total_removed - amount
-                    self.tokens.extend([ColouredToken(type, remaining)])
-                    return [ColouredToken(type, amount)]
-            return removed
+            available = self.tokens.get(type, 0.0)
+            if amount is not None and available > amount:
+                self.tokens[type] = available - amount
+                return [ColouredToken(type, amount)]
+            # Remove everything of this species
+            self.tokens.pop(type, None)
+            return [ColouredToken(type, available)] if available else []
         else:
             # Remove all tokens
-            removed = self.tokens.copy()
+            removed = [ColouredToken(t, a) for t, a in self.tokens.items()]
             self.tokens.clear()
             return removed
 
     def count(self, type=None):
         if type:
-            return sum(t.amount for t in self.tokens if t.type == type)
-        return sum(t.amount for t in self.tokens)
+            return self.tokens.get(type, 0.0)
+        return sum(self.tokens.values())
 
 class Transition:
+    __slots__ = ('name', 'func')
+
     def __init__(self, name, func):
         self.name = name
         self.func = func
@@ -74,125 +91,93 @@ def build_formic_process():
     # Initial tokens
     # -------------------------
     P_feed_gas.add_tokens([
-        ColouredToken("H2", 49),
-        ColouredToken("CO2", 49),
-        ColouredToken("N2", 2)
+        ColouredToken(H2, 49),
+        ColouredToken(CO2, 49),
+        ColouredToken(N2, 2)
     ])
-    P_amine_feed.add_tokens([ColouredToken("Am", 100)])
+    P_amine_feed.add_tokens([ColouredToken(AM, 100)])
 
     # -------------------------
     # Feed transition - SIMPLIFIED
     # -------------------------
     def feed_to_reactor():
         """Move 10 mol of each component to reactor"""
-        # Move 10 mol of each gas component
-        for gas_type in ["H2", "CO2", "N2"]:
-            if P_feed_gas.count(gas_type) >= 1:
-                amount_to_move = min(10, P_feed_gas.count(gas_type))
-                # Remove from feed
-                P_feed_gas.remove_tokens(gas_type, amount_to_move)
-                # Add to reactor
-                P_reactor1.add_tokens(ColouredToken(gas_type, amount_to_move))
-        
+        feed = P_feed_gas.tokens
+        reactor = P_reactor1.tokens
+        for gas_type in (H2, CO2, N2):
+            avail = feed.get(gas_type, 0.0)
+            if avail >= 1:
+                moved = min(10, avail)
+                feed[gas_type] = avail - moved
+                reactor[gas_type] += moved
+
         # Move 10 mol of amine
-        if P_amine_feed.count("Am") >= 1:
-            amount_to_move = min(10, P_amine_feed.count("Am"))
-            P_amine_feed.remove_tokens("Am", amount_to_move)
-            P_reactor1.add_tokens(ColouredToken("Am", amount_to_move))
+        am_avail = P_amine_feed.tokens.get(AM, 0.0)
+        if am_avail >= 1:
+            moved = min(10, am_avail)
+            P_amine_feed.tokens[AM] = am_avail - moved
+            reactor[AM] += moved
 
     def reaction1():
-        """CO2 + H2 ↔ HCOOH, 90% conversion of CO2"""
-        CO2_avail = P_reactor1.count("CO2")
-        H2_avail = P_reactor1.count("H2")
-        
-        if CO2_avail > 0 and H2_avail > 0:
-            # Determine limiting reactant
-            limiting = min(CO2_avail, H2_avail)
-            reacted = limiting * 0.9  # 90% conversion
-            
-            # Remove reacted reactants
-            P_reactor1.remove_tokens("CO2", reacted)
-            P_reactor1.remove_tokens("H2", reacted)
-            
-            # Add product
-            P_reactor1.add_tokens(ColouredToken("HCOOH", reacted))
-            
-            # Add unreacted reactants back
-            P_reactor1.add_tokens(ColouredToken("CO2", CO2_avail - reacted))
-            P_reactor1.add_tokens(ColouredToken("H2", H2_avail - reacted))
+        """CO2 + H2 ↔ HCOOH, 90% conversion of the limiting reactant"""
+        r = P_reactor1.tokens
+        reacted = min(r.get(CO2, 0.0), r.get(H2, 0.0)) * 0.9
+        if reacted > 0:
+            # Delta-only update: subtract what reacted and add the product;
+            # the unreacted remainder just stays in place.
+            r[CO2] -= reacted
+            r[H2] -= reacted
+            r[HCOOH] += reacted
 
     def reaction2():
-        """HCOOH + Am → HCOOH·Am, 90% conversion of HCOOH"""
-        HCOOH_avail = P_reactor1.count("HCOOH")
-        Am_avail = P_reactor1.count("Am")
-        
-        if HCOOH_avail > 0 and Am_avail > 0:
-            limiting = min(HCOOH_avail, Am_avail)
-            reacted = limiting * 0.9  # 90% conversion
-            
-            # Remove reacted reactants
-            P_reactor1.remove_tokens("HCOOH", reacted)
-            P_reactor1.remove_tokens("Am", reacted)
-            
-            # Add product
-            P_HCOOH_Am.add_tokens(ColouredToken("HCOOH·Am", reacted))
-            
-            # Add unreacted reactants back
-            P_reactor1.add_tokens(ColouredToken("HCOOH", HCOOH_avail - reacted))
-            P_reactor1.add_tokens(ColouredToken("Am", Am_avail - reacted))
+        """HCOOH + Am → HCOOH·Am, 90% conversion of the limiting reactant"""
+        r = P_reactor1.tokens
+        reacted = min(r.get(HCOOH, 0.0), r.get(AM, 0.0)) * 0.9
+        if reacted > 0:
+            r[HCOOH] -= reacted
+            r[AM] -= reacted
+            P_HCOOH_Am.tokens[HCOOH_AM] += reacted
 
     def flash():
         """Separate vapour and liquid phases"""
-        # Move all gases to vapour
-        for gas_type in ["CO2", "H2", "N2"]:
-            amount = P_reactor1.count(gas_type)
+        r = P_reactor1.tokens
+        vapour = P_flash_vapour.tokens
+        liquid = P_flash_liquid.tokens
+        # Gases to vapour
+        for gas_type in (CO2, H2, N2):
+            amount = r.pop(gas_type, 0.0)
             if amount > 0:
-                P_reactor1.remove_tokens(gas_type, amount)
-                P_flash_vapour.add_tokens(ColouredToken(gas_type, amount))
-        
-        # Move HCOOH and Am to liquid
-        for liquid_type in ["HCOOH", "Am"]:
-            amount = P_reactor1.count(liquid_type)
+                vapour[gas_type] += amount
+        # HCOOH and Am to liquid
+        for liquid_type in (HCOOH, AM):
+            amount = r.pop(liquid_type, 0.0)
             if amount > 0:
-                P_reactor1.remove_tokens(liquid_type, amount)
-                P_flash_liquid.add_tokens(ColouredToken(liquid_type, amount))
-        
-        # Move HCOOH·Am to liquid
-        hcooh_am_amount = P_HCOOH_Am.count("HCOOH·Am")
+                liquid[liquid_type] += amount
+        # HCOOH·Am to liquid
+        hcooh_am_amount = P_HCOOH_Am.tokens.pop(HCOOH_AM, 0.0)
         if hcooh_am_amount > 0:
-            P_HCOOH_Am.remove_tokens("HCOOH·Am", hcooh_am_amount)
-            P_flash_liquid.add_tokens(ColouredToken("HCOOH·Am", hcooh_am_amount))
+            liquid[HCOOH_AM] += hcooh_am_amount
 
     def purge_recycle():
         """10% purge, 90% recycle"""
-        total_vapour = P_flash_vapour.count()
-        if total_vapour > 0:
-            # Calculate amounts to purge and recycle
-            purge_amount = total_vapour * 0.1
-            recycle_amount = total_vapour * 0.9
-            
-            # Remove all vapour
-            vapour_tokens = P_flash_vapour.remove_tokens()
-            
-            # Distribute to purge and recycle proportionally
-            for token in vapour_tokens:
-                purge_portion = (token.amount / total_vapour) * purge_amount
-                recycle_portion = (token.amount / total_vapour) * recycle_amount
-                
-                if purge_portion > 0:
-                    P_purge.add_tokens(ColouredToken(token.type, purge_portion))
-                if recycle_portion > 0:
-                    P_recycle.add_tokens(ColouredToken(token.type, recycle_portion))
+        vapour = P_flash_vapour.tokens
+        if vapour:
+            purge = P_purge.tokens
+            recycle = P_recycle.tokens
+            # The proportional split reduces to a fixed per-species ratio:
+            # (amount/total)*total*0.1 is just amount*0.1.
+            for species, amount in vapour.items():
+                if amount > 0:
+                    purge[species] += amount * 0.1
+                    recycle[species] += amount * 0.9
+            vapour.clear()
 
     def reaction3():
         """Decompose HCOOH·Am → HCOOH + Am"""
-        hcooh_am_amount = P_flash_liquid.count("HCOOH·Am")
+        hcooh_am_amount = P_flash_liquid.tokens.pop(HCOOH_AM, 0.0)
         if hcooh_am_amount > 0:
-            # Remove HCOOH·Am
-            P_flash_liquid.remove_tokens("HCOOH·Am", hcooh_am_amount)
-            # Add products
-            P_HCOOH_product.add_tokens(ColouredToken("HCOOH", hcooh_am_amount))
-            P_amine_recycle.add_tokens(ColouredToken("Am", hcooh_am_amount))
+            P_HCOOH_product.tokens[HCOOH] += hcooh_am_amount
+            P_amine_recycle.tokens[AM] += hcooh_am_amount
 
     # -------------------------
     # Define transitions
@@ -21,36 +21,47 @@ class QLearningAgent:
             net.T_Final_Separation,
             net.T_Return_Am
         ]
-        self.q_table = {}  # key: state tuple, value: action values
+        # Flat Q-table over the packed state space: bins**6 rows of action
+        # values, indexed by the packed-int state key. Lookups and updates
+        # are contiguous array arithmetic with no tuple hashing and no
+        # per-miss np.zeros allocation. 10 bins -> 10^6 x 9 float32 (~36MB).
+        self.Q = np.zeros((bins ** 6, len(self.actions)), dtype=np.float32)
+        # Mixed-radix weights to pack six bin indices into one int.
+        self._pack_strides = bins ** np.arange(5, -1, -1)
+        # Observed places and their normalisation caps, hoisted so
+        # discretize_state is one vectorized divide+cast per step. The
+        # caps are the feed charges / plausible accumulation bounds —
+        # previously the code divided each value by itself (max(1, val)),
+        # which pinned every non-zero place to the top bin.
+        self._places_of_interest = ('P_CO2_feed', 'P_H2_feed', 'P_Flash_In',
+                                    'P_Liquid_Buffer', 'P_Vapor_Buffer',
+                                    'P_Product_HCOOH')
+        self._max_vals = np.array([98000, 98000, 100000,
+                                   100000, 100000, 100000], dtype=np.float64)
 
     # Discretize state into bins
     def discretize_state(self):
-        places = ['P_CO2_feed', 'P_H2_feed', 'P_Flash_In', 'P_Liquid_Buffer', 'P_Vapor_Buffer', 'P_Product_HCOOH']
-        state = []
-        for p in places:
-            val = self.net.places[p]
-            max_val = max(1, val)  # prevent zero division
-            bin_val = int(val / max_val * (self.bins - 1))
-            state.append(bin_val)
-        return tuple(state)
+        net_places = self.net.places
+        vals = np.fromiter((net_places[p] for p in self._places_of_interest),
+                           dtype=np.float64, count=len(self._places_of_interest))
+        bins = (vals / self._max_vals * (self.bins - 1)).astype(np.int64)
+        # Guard against transient overshoot of the caps
+        np.clip(bins, 0, self.bins - 1, out=bins)
+        return int(bins @ self._pack_strides)
 
     # Choose action using epsilon-greedy
     def choose_action(self, state):
-        if state not in self.q_table:
-            self.q_table[state] = np.zeros(len(self.actions))
         if random.random() < self.epsilon:
             return random.randint(0, len(self.actions)-1)
         else:
-            return int(np.argmax(self.q_table[state]))
+            return int(np.argmax(self.Q[state]))
 
     # Update Q-table
     def update_q(self, state, action, reward, next_state):
-        if next_state not in self.q_table:
-            self.q_table[next_state] = np.zeros(len(self.actions))
-        old_value = self.q_table[state][action]
-        next_max = np.max(self.q_table[next_state])
-        new_value = old_value + self.alpha * (reward + self.gamma * next_max - old_value)
-        self.q_table[state][action] = new_value
+        Q = self.Q
+        old_value = Q[state, action]
+        next_max = Q[next_state].max()
+        Q[state, action] = old_value + self.alpha * (reward + self.gamma * next_max - old_value)
 
     # Run one episode
     def run_episode(self, max_steps=20):
@@ -5,141 +5,176 @@ import torch.nn as nn
 import torch.optim as optim
 import matplotlib.pyplot as plt
 
+# Optional numba, same pattern as the Monopoly simulator: the transition
+# kernels below are pure float-matrix arithmetic and compile to native
+# loops when numba is installed, and run as plain numpy otherwise.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # -------------------------
 # Coloured Petri Net
 # -------------------------
+# Integer enums for the marking matrix axes. The observed places come
+# first so the DQN state vector is a contiguous M[:6] slice.
+SPECIES = {'CO2': 0, 'H2': 1, 'N2': 2, 'HCOOH': 3, 'Am': 4, 'HCOOH·Am': 5}
+PLACES = {'Feed': 0, 'R1': 1, 'Flash_Liquid': 2, 'Flash_Vapor': 3,
+          'Recycle': 4, 'R2': 5, 'Purge': 6, 'Product_HCOOH': 7,
+          'Am_Recycle': 8}
+
+_CO2, _H2, _N2, _HCOOH, _AM, _COMPLEX = range(6)
+_FEED, _R1, _FLASH_LIQ, _FLASH_VAP, _RECYCLE, _R2, _PURGE, _PRODUCT, _AM_REC = range(9)
+
+# Species routed to the liquid phase at the flash drum / returned to feed.
+_LIQUID_MASK = np.zeros(6)
+_LIQUID_MASK[[_HCOOH, _AM, _COMPLEX]] = 1.0
+_FEED_RETURN_MASK = np.zeros(6)
+_FEED_RETURN_MASK[[_CO2, _H2, _N2, _HCOOH]] = 1.0
+
+
+# Transition kernels: free functions over the marking matrix only, so
+# numba can compile them (no dicts, no attribute chasing in the body).
+def _fire_rxn1(M):
+    react_amt = min(M[_FEED, _CO2], M[_FEED, _H2]) * 0.9
+    if react_amt > 0:
+        M[_FEED, _CO2] -= react_amt
+        M[_FEED, _H2] -= react_amt
+        M[_R1, _HCOOH] += react_amt
+
+
+def _fire_rxn2(M):
+    react_amt = min(M[_R1, _HCOOH], M[_FEED, _AM]) * 0.9
+    if react_amt > 0:
+        M[_R1, _HCOOH] -= react_amt
+        M[_FEED, _AM] -= react_amt
+        M[_R1, _COMPLEX] += react_amt
+
+
+def _fire_to_flash(M):
+    row = M[_R1]
+    M[_FLASH_LIQ] += row * _LIQUID_MASK
+    M[_FLASH_VAP] += row * (1.0 - _LIQUID_MASK)
+    row[:] = 0.0
+
+
+def _fire_flash_split(M):
+    amt = M[_FLASH_LIQ, _HCOOH]
+    liq_amt = float(int(0.95 * amt))
+    M[_FLASH_LIQ, _HCOOH] = liq_amt
+    M[_FLASH_VAP, _HCOOH] += amt - liq_amt
+
+
+def _fire_vapor_split(M):
+    row = M[_FLASH_VAP]
+    rec = np.floor(0.9 * row)
+    M[_RECYCLE] += rec
+    M[_PURGE] += row - rec
+    row[:] = 0.0
+
+
+def _fire_recycle_to_feed(M):
+    M[_FEED] += M[_RECYCLE] * _FEED_RETURN_MASK
+    M[_RECYCLE, :] = 0.0
+
+
+def _fire_r2_crack(M):
+    M[_R2] += M[_FLASH_LIQ]
+    M[_FLASH_LIQ, :] = 0.0
+
+    complex_amt = M[_R2, _COMPLEX]
+    if complex_amt > 0:
+        M[_R2, _COMPLEX] = 0.0
+        M[_R2, _HCOOH] += complex_amt
+        M[_R2, _AM] += complex_amt
+
+
+def _fire_final_separation(M):
+    M[_PRODUCT, _HCOOH] += M[_R2, _HCOOH]
+    M[_AM_REC, _AM] += M[_R2, _AM]
+    M[_R2, :] = 0.0
+
+
+def _fire_return_am(M):
+    M[_FEED] += M[_AM_REC]
+    M[_AM_REC, :] = 0.0
+
+
+if njit is not None:
+    _fire_rxn1 = njit(cache=True)(_fire_rxn1)
+    _fire_rxn2 = njit(cache=True)(_fire_rxn2)
+    _fire_to_flash = njit(cache=True)(_fire_to_flash)
+    _fire_flash_split = njit(cache=True)(_fire_flash_split)
+    _fire_vapor_split = njit(cache=True)(_fire_vapor_split)
+    _fire_recycle_to_feed = njit(cache=True)(_fire_recycle_to_feed)
+    _fire_r2_crack = njit(cache=True)(_fire_r2_crack)
+    _fire_final_separation = njit(cache=True)(_fire_final_separation)
+    _fire_return_am = njit(cache=True)(_fire_return_am)
+
+
 class ColouredPetriNet:
     def __init__(self):
-        self.places = {
-            'Feed': [
-                {'species': 'CO2', 'amount': 98000},
-                {'species': 'H2', 'amount': 98000},
-                {'species': 'N2', 'amount': 4000},
-                {'species': 'Am', 'amount': 88200}
-            ],
-            'R1': [],
-            'Flash_Liquid': [],
-            'Flash_Vapor': [],
-            'Recycle': [],
-            'Purge': [],
-            'R2': [],
-            'Product_HCOOH': [],
-            'Am_Recycle': []
-        }
+        # Marking matrix: rows are places, columns are species. Token-list
+        # scans become single array cells and whole-place transfers become
+        # row arithmetic.
+        self.M = np.zeros((len(PLACES), len(SPECIES)), dtype=np.float64)
+        self.M[_FEED, _CO2] = 98000
+        self.M[_FEED, _H2] = 98000
+        self.M[_FEED, _N2] = 4000
+        self.M[_FEED, _AM] = 88200
+        # Initial marking kept for O(1) episode resets.
+        self._M0 = self.M.copy()
+
+    def reset(self):
+        """Restore the initial marking in place (one memcpy, no realloc)."""
+        np.copyto(self.M, self._M0)
 
     def print_marking(self):
         print("Current marking:")
-        for place, tokens in self.places.items():
-            summary = {}
-            for t in tokens:
-                summary[t['species']] = summary.get(t['species'], 0) + t['amount']
+        for place, p in PLACES.items():
+            summary = {sp: self.M[p, s] for sp, s in SPECIES.items()
+                       if self.M[p, s] != 0}
             print(f"{place}: {summary}")
 
     def get_amount(self, place, species):
-        return sum(t['amount'] for t in self.places[place] if t['species']==species)
+        return float(self.M[PLACES[place], SPECIES[species]])
 
     def remove_species(self, place, species, amount):
-        tokens = self.places[place]
-        removed = 0
-        new_tokens = []
-        for t in tokens:
-            if t['species'] == species and removed < amount:
-                take = min(t['amount'], amount - removed)
-                removed += take
-                if t['amount'] > take:
-                    new_tokens.append({'species': species, 'amount': t['amount'] - take})
-            else:
-                new_tokens.append(t)
-        self.places[place] = new_tokens
+        cell = self.M[PLACES[place], SPECIES[species]]
+        self.M[PLACES[place], SPECIES[species]] = max(0.0, cell - amount)
 
     def add_token(self, place, species, amount):
-        for t in self.places[place]:
-            if t['species'] == species:
-                t['amount'] += amount
-                return
-        self.places[place].append({'species': species, 'amount': amount})
+        self.M[PLACES[place], SPECIES[species]] += amount
 
     # -------------------------
-    # Transitions
+    # Transitions (thin wrappers over the compiled kernels)
     # -------------------------
     def T_R1_rxn1(self):
-        co2_amt = self.get_amount('Feed','CO2')
-        h2_amt = self.get_amount('Feed','H2')
-        conv = 0.9
-        react_amt = min(co2_amt, h2_amt) * conv
-        if react_amt > 0:
-            self.remove_species('Feed','CO2', react_amt)
-            self.remove_species('Feed','H2', react_amt)
-            self.add_token('R1','HCOOH', react_amt)
+        _fire_rxn1(self.M)
 
     def T_R1_rxn2(self):
-        hcooh_amt = self.get_amount('R1','HCOOH')
-        am_amt = self.get_amount('Feed','Am')
-        conv = 0.9
-        react_amt = min(hcooh_amt, am_amt) * conv
-        if react_amt > 0:
-            self.remove_species('R1','HCOOH', react_amt)
-            self.remove_species('Feed','Am', react_amt)
-            self.add_token('R1','HCOOH·Am', react_amt)
+        _fire_rxn2(self.M)
 
     def T_R1_to_flash(self):
-        for t in list(self.places['R1']):
-            self.add_token('Flash_Liquid' if t['species'] in ['HCOOH','HCOOH·Am','Am'] else 'Flash_Vapor', t['species'], t['amount'])
-        self.places['R1'] = []
+        _fire_to_flash(self.M)
 
     def T_Flash_split(self):
-        new_flash_liquid = []
-        new_flash_vapor = []
-        for t in list(self.places['Flash_Liquid']):
-            if t['species']=='HCOOH':
-                liq_amt = int(0.95 * t['amount'])
-                vap_amt = t['amount'] - liq_amt
-                if liq_amt>0: new_flash_liquid.append({'species':'HCOOH','amount':liq_amt})
-                if vap_amt>0: new_flash_vapor.append({'species':'HCOOH','amount':vap_amt})
-            else:
-                new_flash_liquid.append(t)
-        self.places['Flash_Liquid'] = new_flash_liquid
-        self.places['Flash_Vapor'].extend(new_flash_vapor)
+        _fire_flash_split(self.M)
 
     def T_Vapor_split(self):
-        new_recycle = []
-        for t in list(self.places['Flash_Vapor']):
-            rec_amt = int(0.9 * t['amount'])
-            purge_amt = t['amount'] - rec_amt
-            if rec_amt>0: new_recycle.append({'species': t['species'], 'amount': rec_amt})
-            if purge_amt>0: self.add_token('Purge', t['species'], purge_amt)
-        self.places['Recycle'].extend(new_recycle)
-        self.places['Flash_Vapor'] = []
+        _fire_vapor_split(self.M)
 
     def T_Recycle_to_feed(self):
-        for t in list(self.places['Recycle']):
-            if t['species'] in ['CO2','H2','N2','HCOOH']:
-                self.add_token('Feed', t['species'], t['amount'])
-        self.places['Recycle'] = []
+        _fire_recycle_to_feed(self.M)
 
     def T_R2_crack(self):
-        for t in list(self.places['Flash_Liquid']):
-            self.add_token('R2', t['species'], t['amount'])
-        self.places['Flash_Liquid'] = []
-
-        complex_amt = self.get_amount('R2','HCOOH·Am')
-        if complex_amt>0:
-            self.remove_species('R2','HCOOH·Am', complex_amt)
-            self.add_token('R2','HCOOH', complex_amt)
-            self.add_token('R2','Am', complex_amt)
+        _fire_r2_crack(self.M)
 
     def T_Final_separation(self):
-        for t in list(self.places['R2']):
-            if t['species']=='HCOOH':
-                self.add_token('Product_HCOOH', t['species'], t['amount'])
-            elif t['species']=='Am':
-                self.add_token('Am_Recycle', t['species'], t['amount'])
-        self.places['R2'] = []
+        _fire_final_separation(self.M)
 
     def T_Return_Am(self):
-        for t in list(self.places['Am_Recycle']):
-            self.add_token('Feed', t['species'], t['amount'])
-        self.places['Am_Recycle'] = []
+        _fire_return_am(self.M)
 
 # -------------------------
 # DQN Agent
@@ -158,13 +193,30 @@ class DQN(nn.Module):
         return self.fc(x)
 
 class DQNAgent:
+    REPLAY_CAPACITY = 10000
+    BATCH_SIZE = 32
+    TRAIN_EVERY = 4  # gradient step every N environment steps
+
     def __init__(self, net, lr=1e-3, gamma=0.9, epsilon=0.2):
         self.net = net
         self.epsilon = epsilon
         self.gamma = gamma
-        self.model = DQN(input_dim=12, output_dim=9)
+        self.model = DQN(input_dim=36, output_dim=9)
         self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
         self.loss_fn = nn.MSELoss()
+        # Two persistent state buffers, alternated per call, so state and
+        # next_state never alias each other while get_state_vector stays
+        # allocation-free (copy_ converts float64 -> float32 in place).
+        self._state_bufs = (torch.empty(36, dtype=torch.float32),
+                            torch.empty(36, dtype=torch.float32))
+        self._buf_idx = 0
+        # Ring-buffer replay: one row per transition, laid out as
+        # [state(36) | next_state(36) | action | reward].
+        self.replay = np.zeros((self.REPLAY_CAPACITY, 36 * 2 + 2),
+                               dtype=np.float32)
+        self._replay_len = 0
+        self._replay_pos = 0
+        self._step_count = 0
         self.actions = [
             net.T_R1_rxn1,
             net.T_R1_rxn2,
@@ -178,16 +230,19 @@ class DQNAgent:
         ]
 
     def get_state_vector(self):
-        places = ['Feed','R1','Flash_Liquid','Flash_Vapor','Recycle','R2']
-        species = ['CO2','H2','N2','HCOOH','Am','HCOOH·Am']
-        state = []
-        for place in places:
-            for sp in species:
-                state.append(self.net.get_amount(place, sp))
-        return torch.tensor(state,dtype=torch.float32)
-
-    def choose_action(self):
-        state = self.get_state_vector()
+        # The observed places occupy the first six rows of the marking
+        # matrix, so the 36-entry state is one contiguous slice-and-copy
+        # instead of 36 per-cell lookups. from_numpy wraps the slice
+        # without copying; the only copy is the fill of the reused buffer.
+        buf = self._state_bufs[self._buf_idx]
+        self._buf_idx ^= 1
+        buf.copy_(torch.from_numpy(self.net.M[:6].ravel()))
+        return buf
+
+    def choose_action(self, state):
+        # Takes the already-fetched state: a second get_state_vector()
+        # call here would flip the buffer alternation and alias state
+        # with next_state in the training loop.
         if random.random() < self.epsilon:
             return random.randint(0,len(self.actions)-1)
         else:
@@ -196,11 +251,36 @@ class DQNAgent:
             return int(torch.argmax(qvals))
 
     def train_step(self, state, action, reward, next_state):
+        # Push the transition into the ring buffer; gradient steps run on
+        # sampled minibatches every TRAIN_EVERY steps instead of a
+        # batch-of-1 forward/backward per transition.
+        row = self.replay[self._replay_pos]
+        row[:36] = state.numpy()
+        row[36:72] = next_state.numpy()
+        row[72] = action
+        row[73] = reward
+        self._replay_pos = (self._replay_pos + 1) % self.REPLAY_CAPACITY
+        self._replay_len = min(self._replay_len + 1, self.REPLAY_CAPACITY)
+
+        self._step_count += 1
+        if (self._step_count % self.TRAIN_EVERY != 0
+                or self._replay_len < self.BATCH_SIZE):
+            return
+
+        idx = np.random.randint(0, self._replay_len, size=self.BATCH_SIZE)
+        batch = self.replay[idx]
+        states = torch.from_numpy(batch[:, :36])
+        next_states = torch.from_numpy(batch[:, 36:72])
+        actions = torch.from_numpy(batch[:, 72].astype(np.int64)).unsqueeze(1)
+        rewards = torch.from_numpy(batch[:, 73])
+
         self.optimizer.zero_grad()
-        qvals = self.model(state)
-        next_qvals = self.model(next_state)
+        qvals = self.model(states)
+        with torch.no_grad():
+            next_max = self.model(next_states).max(dim=1).values
         target = qvals.clone().detach()
-        target[action] = reward + self.gamma*torch.max(next_qvals)
+        target.scatter_(1, actions,
+                        (rewards + self.gamma * next_max).unsqueeze(1))
         loss = self.loss_fn(qvals, target)
         loss.backward()
         self.optimizer.step()
@@ -211,11 +291,11 @@ class DQNAgent:
 def train(agent, episodes=200):
     rewards = []
     for ep in range(episodes):
-        agent.net.__init__() # reset Petri Net
+        agent.net.reset() # reset Petri Net
         total_reward = 0
         state = agent.get_state_vector()
         for step in range(20):
-            action_idx = agent.choose_action()
+            action_idx = agent.choose_action(state)
             action_func = agent.actions[action_idx]
             prev_product = agent.net.get_amount('Product_HCOOH','HCOOH')
             action_func()
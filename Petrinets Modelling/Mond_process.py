@@ -1,74 +1,391 @@
 import random
-import uuid
-from collections import defaultdict, deque
-from copy import deepcopy
+from collections import defaultdict
+from itertools import count as _counter
+
+import numpy as np
+
+import token_pool
+from engine_kernels import enabled_mask, fire_inplace
 
 # -------------------------
 # Token, Place, Transition
 # -------------------------
 
+# Int codes for token types: the store keeps one int8 per token instead of
+# a Python string reference. New types register themselves on first use.
+TYPE_ID = {"Ni_ore": 0, "CO": 1, "NiCO4": 2, "Ni_pure": 3, "material": 4}
+TYPE_NAME = list(TYPE_ID)
+
+# Capacity sentinel for unbounded places: a real int means every capacity
+# check is one branch-predictable compare, with no None test, and the
+# capacity vector stays a plain int32 column.
+_INT_MAX = 2 ** 31 - 1
+
+
+def _type_id(ttype):
+    tid = TYPE_ID.get(ttype)
+    if tid is None:
+        tid = TYPE_ID[ttype] = len(TYPE_NAME)
+        TYPE_NAME.append(ttype)
+    return tid
+
+
+# Fallback id stream for tokens constructed without an explicit batch id.
+# A plain counter replaces uuid4, which cost a urandom syscall plus a
+# 36-char string allocation per produced token; ids are formatted only
+# when a token is actually displayed.
+_token_ids = _counter(1)
+
+
+def _format_token_id(bid):
+    return f"T{bid:08x}" if type(bid) is int else bid
+
+
 class ColouredToken:
+    # Thousands of tokens live in the hot simulation loops; slots drop the
+    # per-instance dict and make every field read a C-level slot lookup.
+    __slots__ = ('type', 'batch_id', 'mass', 'T', 'purity', 'time_in_process')
+
     def __init__(self, ttype: str, batch_id: str = None, mass: float = 1.0, T: float = None, purity: float = None):
         self.type = ttype          # e.g., 'Ni_ore','CO','NiCO4','Ni_pure'
-        self.batch_id = batch_id or str(uuid.uuid4())[:8]
+        self.batch_id = next(_token_ids) if batch_id is None else batch_id
         self.mass = mass
         self.T = T                 # temperature (C)
         self.purity = purity       # fraction 0..1
         self.time_in_process = 0.0
 
     def copy(self):
-        return deepcopy(self)
+        # All fields are immutable primitives, so a field-by-field clone
+        # replaces deepcopy's memo walk and __reduce_ex__ machinery.
+        c = ColouredToken.__new__(ColouredToken)
+        c.type = self.type
+        c.batch_id = self.batch_id
+        c.mass = self.mass
+        c.T = self.T
+        c.purity = self.purity
+        c.time_in_process = self.time_in_process
+        return c
+
+    @classmethod
+    def acquire(cls, ttype, batch_id=None, mass=1.0, T=None, purity=None):
+        """Pooled constructor: reuse a released instance when one exists.
+
+        The SoA stores copy fields out on add and never hold the object,
+        so tokens built here live only for the span of one firing; the
+        free list turns that churn into slot rewrites. Pair with
+        release() once the token has been handed to a place.
+        """
+        tok = token_pool.take()
+        if tok is None:
+            tok = cls.__new__(cls)
+        tok.type = ttype
+        tok.batch_id = next(_token_ids) if batch_id is None else batch_id
+        tok.mass = mass
+        tok.T = T
+        tok.purity = purity
+        tok.time_in_process = 0.0
+        return tok
+
+    release = staticmethod(token_pool.give)
 
     def __repr__(self):
-        return f"{self.type}[{self.batch_id}|pur={self.purity}|T={self.T}]"
+        return f"{self.type}[{_format_token_id(self.batch_id)}|pur={self.purity}|T={self.T}]"
+
+class TokenStore:
+    """Struct-of-arrays token storage backing a Place.
+
+    One NumPy column per numeric token field plus a plain list for the
+    rare string batch id; the first `live` rows are valid. Counting, mass
+    sums and per-type grouping become array ops over contiguous memory
+    instead of pointer-chasing a list of token objects, and removal swaps
+    rows with the live tail so it never shifts memory.
+    """
+    __slots__ = ('types', 'mass', 'T', 'purity', 'batch_ids', 'live')
+
+    def __init__(self, capacity=16):
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.mass = np.zeros(capacity, dtype=np.float32)
+        self.T = np.zeros(capacity, dtype=np.float32)        # NaN = unset
+        self.purity = np.zeros(capacity, dtype=np.float32)   # NaN = unset
+        self.batch_ids = []
+        self.live = 0
+
+    def _grow(self, needed):
+        size = len(self.types)
+        while size < needed:
+            size *= 2
+        for field in ('types', 'mass', 'T', 'purity'):
+            old = getattr(self, field)
+            new = np.empty(size, dtype=old.dtype)
+            new[:self.live] = old[:self.live]
+            setattr(self, field, new)
+
+    def extend(self, tokens):
+        """Append ColouredToken records; grows the columns at most once."""
+        need = self.live + len(tokens)
+        if need > len(self.types):
+            self._grow(need)
+        i = self.live
+        for t in tokens:
+            self.types[i] = _type_id(t.type)
+            self.mass[i] = t.mass
+            self.T[i] = np.nan if t.T is None else t.T
+            self.purity[i] = np.nan if t.purity is None else t.purity
+            self.batch_ids.append(t.batch_id)
+            i += 1
+        self.live = i
+
+    def view(self, i):
+        """Materialize row i as a detached (pooled) ColouredToken record."""
+        T = self.T[i]
+        purity = self.purity[i]
+        return ColouredToken.acquire(
+            TYPE_NAME[self.types[i]],
+            batch_id=_format_token_id(self.batch_ids[i]),
+            mass=float(self.mass[i]),
+            T=None if np.isnan(T) else float(T),
+            purity=None if np.isnan(purity) else float(purity))
+
+    def append_default(self, type_id, n, batch_ids, T, purity):
+        """Bulk-append n identical default tokens as sliced column writes."""
+        need = self.live + n
+        if need > len(self.types):
+            self._grow(need)
+        i = self.live
+        self.types[i:need] = type_id
+        self.mass[i:need] = 1.0
+        self.T[i:need] = T
+        self.purity[i:need] = purity
+        self.batch_ids.extend(batch_ids)
+        self.live = need
+
+    def extend_arrays(self, types, mass, T, purity, batch_ids):
+        """Bulk-append column slices (the receiving half of a subset move)."""
+        n = len(types)
+        need = self.live + n
+        if need > len(self.types):
+            self._grow(need)
+        self.types[self.live:need] = types
+        self.mass[self.live:need] = mass
+        self.T[self.live:need] = T
+        self.purity[self.live:need] = purity
+        self.batch_ids.extend(batch_ids)
+        self.live = need
+
+    def drop(self, n):
+        """Remove the first n rows (the rows default selection consumes)."""
+        self.swap_remove(range(n))
+
+    def swap_remove(self, indices):
+        """Remove rows by index; each removal is an O(1) swap with the tail."""
+        for i in sorted(indices, reverse=True):
+            last = self.live - 1
+            if i != last:
+                self.types[i] = self.types[last]
+                self.mass[i] = self.mass[last]
+                self.T[i] = self.T[last]
+                self.purity[i] = self.purity[last]
+                self.batch_ids[i] = self.batch_ids[last]
+            self.batch_ids.pop()
+            self.live = last
+
+    def type_counts(self):
+        counts = np.bincount(self.types[:self.live], minlength=len(TYPE_NAME))
+        return {TYPE_NAME[t]: int(c) for t, c in enumerate(counts) if c}
+
+    def clear(self):
+        self.live = 0
+        self.batch_ids.clear()
+
 
 class Place:
+    __slots__ = ('name', 'store', 'capacity', '_net', '_pid')
+
     def __init__(self, name: str, capacity: int = None):
         self.name = name
-        self.tokens = []   # list of ColouredToken
-        self.capacity = capacity  # None means unlimited; otherwise number of tokens allowed
+        # None means unlimited and is stored as the int sentinel
+        self.capacity = _INT_MAX if capacity is None else capacity
+        self.store = TokenStore()
+        # Set by PetriNet.add_place; the mutators below mirror every count
+        # change into the net's marking vector so it is never stale.
+        self._net = None
+        self._pid = -1
 
     def add_tokens(self, tokens):
-        if isinstance(tokens, list):
-            for t in tokens:
-                if self.capacity is not None and len(self.tokens) >= self.capacity:
-                    raise ValueError(f"Place {self.name} capacity exceeded")
-                self.tokens.append(t)
-        else:
-            if self.capacity is not None and len(self.tokens) >= self.capacity:
-                raise ValueError(f"Place {self.name} capacity exceeded")
-            self.tokens.append(tokens)
+        toks = tokens if isinstance(tokens, list) else [tokens]
+        if self.store.live + len(toks) > self.capacity:
+            raise ValueError(f"Place {self.name} capacity exceeded")
+        self.store.extend(toks)
+        if self._net is not None:
+            self._net._marking[self._pid] += len(toks)
 
-    def remove_tokens(self, tokens):
-        # tokens: list of token objects to remove (by identity)
-        for t in tokens:
-            self.tokens.remove(t)
+    def remove_tokens(self, indices):
+        # indices: store row indices to remove (as returned by find_tokens)
+        self.store.swap_remove(indices)
+        if self._net is not None:
+            self._net._marking[self._pid] -= len(indices)
+
+    def consume(self, n):
+        """Remove the first n tokens (specialized count-only fire path)."""
+        self.store.drop(n)
+        if self._net is not None:
+            self._net._marking[self._pid] -= n
+
+    def add_default(self, type_id, n, batch_ids, T, purity):
+        """Bulk-add n default tokens of one type (specialized fire path)."""
+        if self.store.live + n > self.capacity:
+            raise ValueError(f"Place {self.name} capacity exceeded")
+        self.store.append_default(type_id, n, batch_ids, T, purity)
+        if self._net is not None:
+            self._net._marking[self._pid] += n
+
+    def move_subset(self, dest, mask):
+        """Move the live rows selected by boolean mask into dest.
+
+        Pure array traffic: the masked column slices are appended to dest
+        in one shot and the source compacts itself with the inverse mask -
+        no token objects and no per-row dispatch. Note the surviving rows
+        renumber, so masks computed beforehand only stay valid for the
+        first move. Returns the number of tokens moved.
+        """
+        store = self.store
+        live = store.live
+        n = int(mask.sum())
+        if n == 0:
+            return 0
+        if dest.store.live + n > dest.capacity:
+            raise ValueError(f"Place {dest.name} capacity exceeded")
+        ids = store.batch_ids
+        dest.store.extend_arrays(store.types[:live][mask], store.mass[:live][mask],
+                                 store.T[:live][mask], store.purity[:live][mask],
+                                 [ids[i] for i in np.flatnonzero(mask)])
+        keep = ~mask
+        k = live - n
+        store.types[:k] = store.types[:live][keep]
+        store.mass[:k] = store.mass[:live][keep]
+        store.T[:k] = store.T[:live][keep]
+        store.purity[:k] = store.purity[:live][keep]
+        store.batch_ids = [ids[i] for i in np.flatnonzero(keep)]
+        store.live = k
+        if self._net is not None:
+            self._net._marking[self._pid] -= n
+        if dest._net is not None:
+            dest._net._marking[dest._pid] += n
+        return n
 
     def count(self):
-        return len(self.tokens)
+        return self.store.live
+
+    def total_mass(self):
+        return float(self.store.mass[:self.store.live].sum())
+
+    def type_counts(self):
+        """Token counts keyed by type, for status displays."""
+        return self.store.type_counts()
+
+    def token(self, i):
+        """ColouredToken record for store row i."""
+        return self.store.view(i)
 
     def find_tokens(self, condition_fn=None, limit=None):
         """
-        Return a list of tokens satisfying condition_fn (or all if None).
-        condition_fn(token) -> bool
-        limit: maximum number of tokens to return
+        Return store indices of tokens satisfying condition_fn (or all if None).
+        condition_fn(token) -> bool, called on a materialized token view.
+        limit: maximum number of indices to return
         """
+        live = self.store.live
+        if condition_fn is None:
+            return list(range(live if limit is None else min(limit, live)))
         selected = []
-        for t in self.tokens:
-            if condition_fn is None or condition_fn(t):
-                selected.append(t)
+        for i in range(live):
+            if condition_fn(self.store.view(i)):
+                selected.append(i)
                 if limit is not None and len(selected) >= limit:
                     break
         return selected
 
     def clear(self):
-        self.tokens = []
+        self.store.clear()
+        if self._net is not None:
+            self._net._marking[self._pid] = 0
 
     def __repr__(self):
         return f"Place({self.name}):{self.count()}"
 
+def _default_token_spec(out_place_name):
+    """Token type and attribute defaults for integer-weight outputs.
+
+    The same inference the generic fire path applies per produced token,
+    hoisted so bind-time specialization runs it exactly once. Returns
+    (type, T, purity, id_style).
+    """
+    if "NiCO4" in out_place_name:
+        return "NiCO4", 25.0, None, "batch"
+    if "CO" in out_place_name.upper() or out_place_name.lower().startswith("p_co"):
+        return "CO", None, None, "counter"
+    if "Ni" in out_place_name and "pure" in out_place_name:
+        return "Ni_pure", None, 0.99, "counter"
+    return "material", None, None, "counter"
+
+
+def _counter_token_id(petri):
+    tid = petri._next_token_id
+    petri._next_token_id = tid + 1
+    return tid
+
+
+def _batch_token_id(petri):
+    return f"B-{petri.next_batch_id()}"
+
+
+def _make_default_factory(ttype, T, purity, id_fn):
+    """Prebaked factory for one output place's default tokens: the type and
+    attributes are closed over, so producing a token is a straight
+    constructor call with no inference or branching."""
+    def factory(petri):
+        return ColouredToken.acquire(ttype, batch_id=id_fn(petri), mass=1.0, T=T, purity=purity)
+    return factory
+
+
+def _make_count_only_fire(in_places, out_specs):
+    """exec a firing function with the transition's structure as literals.
+
+    in_places: list of (Place, weight); out_specs: list of
+    (Place, weight, type_id, T, purity, id_fn). The generated body is a
+    straight-line enabledness check plus consume/add_default calls with
+    literal weights and type codes - no dict iteration, no per-fire type
+    inference, no guard/callable branching.
+    """
+    env = {'nan': float('nan')}
+    checks = []
+    body = []
+    for k, (place, w) in enumerate(in_places):
+        env[f"in{k}"] = place
+        checks.append(f"in{k}.store.live < {w}")
+        body.append(f"    in{k}.consume({w})")
+    for k, (place, w, type_id, T, purity, id_fn) in enumerate(out_specs):
+        env[f"out{k}"] = place
+        env[f"mk{k}"] = id_fn
+        t_lit = 'nan' if T is None else repr(T)
+        p_lit = 'nan' if purity is None else repr(purity)
+        body.append(f"    out{k}.add_default({type_id}, {w}, "
+                    f"[mk{k}(petri) for _ in range({w})], {t_lit}, {p_lit})")
+    src = ["def _fire(petri):"]
+    if checks:
+        src.append(f"    if {' or '.join(checks)}:")
+        src.append("        return False")
+    src.extend(body)
+    src.append("    return True")
+    exec("\n".join(src), env)
+    return env['_fire']
+
+
 class Transition:
-    def __init__(self, name: str, inputs: dict, outputs: dict, guard=None, description: str = ""):
+    __slots__ = ('name', 'inputs', 'outputs', 'guard', 'description',
+                 'count_effects', 'fired_count', '_fire', '_default_factories')
+
+    def __init__(self, name: str, inputs: dict, outputs: dict, guard=None,
+                 description: str = "", count_effects: dict = None):
         """
         inputs: dict place_name -> weight (int)
         outputs: dict place_name -> weight (int) or token factory function
@@ -76,13 +393,50 @@ class Transition:
                This guard runs after token selection (or can inspect places). If returns False, firing aborts.
         outputs may be a mapping place->callable(selected_tokens) returning list of tokens to add, OR
         a mapping place->int weight to produce default tokens (template-based).
+        count_effects: dict place_name -> produced-token count for callable
+        outputs, so the net's output-incidence row stays complete for
+        marking-level reasoning. Integer-weight outputs need no declaration.
         """
         self.name = name
         self.inputs = inputs or {}
         self.outputs = outputs or {}
         self.guard = guard
         self.description = description
+        self.count_effects = count_effects or {}
         self.fired_count = 0
+        self._fire = None             # set by bind() for count-only transitions
+        self._default_factories = {}  # out place -> default-token factory
+
+    def bind(self, petri):
+        """Specialize firing at registration time where the structure allows.
+
+        A transition whose outputs are all integer weights and which has no
+        guard is completely structural, so its fire reduces to the exec'd
+        straight-line closure from _make_count_only_fire. Anything with a
+        guard, a callable output, or an unknown place keeps the generic
+        path (_fire stays None).
+        """
+        self._fire = None
+        # Integer-weight outputs get their token factory resolved here once
+        # (type inference, attributes, id style), whether or not the whole
+        # transition can be specialized below.
+        for pname, out_val in self.outputs.items():
+            if not callable(out_val):
+                ttype, T, purity, id_style = _default_token_spec(pname)
+                id_fn = _batch_token_id if id_style == "batch" else _counter_token_id
+                self._default_factories[pname] = _make_default_factory(ttype, T, purity, id_fn)
+        if self.guard is not None or any(callable(v) for v in self.outputs.values()):
+            return
+        if any(n not in petri.places for n in list(self.inputs) + list(self.outputs)):
+            return
+        in_places = [(petri.places[p], w) for p, w in self.inputs.items()]
+        out_specs = []
+        for pname, w in self.outputs.items():
+            ttype, T, purity, id_style = _default_token_spec(pname)
+            id_fn = _batch_token_id if id_style == "batch" else _counter_token_id
+            out_specs.append((petri.places[pname], int(w), _type_id(ttype),
+                              T, purity, id_fn))
+        self._fire = _make_count_only_fire(in_places, out_specs)
 
     def is_enabled(self, petri):
         # Check counts only (not guards)
@@ -97,7 +451,7 @@ class Transition:
         """
         Select tokens to consume on firing, according to inputs mapping.
         Selection policy: take first tokens that match optional per-place condition in guard.
-        We return a dict: place_name -> list(tokens)
+        We return a dict: place_name -> list(store indices)
         """
         selected = {}
         for pname, w in self.inputs.items():
@@ -110,6 +464,12 @@ class Transition:
         return selected
 
     def fire(self, petri):
+        if self._fire is not None:
+            if self._fire(petri):
+                self.fired_count += 1
+                return True, None
+            return False, "not enabled by counts"
+
         if not self.is_enabled(petri):
             return False, "not enabled by counts"
 
@@ -117,45 +477,56 @@ class Transition:
         if selected is None:
             return False, "couldn't select tokens"
 
-        # Evaluate guard if present. Provide shallow copy of selected tokens for guard checking.
+        # Guards and callable outputs inspect token attributes, so the
+        # selected rows are materialized as views before removal; count-only
+        # transitions never pay for token objects at all.
+        views = None
+        if self.guard is not None or any(callable(v) for v in self.outputs.values()):
+            views = {pname: [petri.places[pname].token(i) for i in idxs]
+                     for pname, idxs in selected.items()}
+
         if self.guard:
-            if not self.guard(petri, selected):
+            if not self.guard(petri, views):
+                for toks in views.values():
+                    for tok in toks:
+                        ColouredToken.release(tok)
                 return False, "guard blocked firing"
 
         # Remove tokens
-        for pname, toks in selected.items():
-            petri.places[pname].remove_tokens(toks)
+        for pname, idxs in selected.items():
+            petri.places[pname].remove_tokens(idxs)
 
         # Add outputs
-        to_add = []
         for out_place_name, out_val in self.outputs.items():
             if callable(out_val):
                 # outputs expressed as function producing token(s)
-                new_tokens = out_val(selected, petri)
+                new_tokens = out_val(views, petri)
                 if new_tokens:
-                    petri.places[out_place_name].add_tokens(new_tokens if isinstance(new_tokens, list) else [new_tokens])
+                    toks = new_tokens if isinstance(new_tokens, list) else [new_tokens]
+                    petri.places[out_place_name].add_tokens(toks)
+                    for tok in toks:
+                        ColouredToken.release(tok)
             else:
-                # out_val is integer weight: produce default tokens based on context
-                # create simple tokens by inspecting inputs where possible
-                produced = []
-                # try to infer type from transition name or inputs (simplified rule set)
-                for i in range(int(out_val)):
-                    # basic inference heuristics
-                    if "NiCO4" in out_place_name or "NiCO4" in out_place_name.upper():
-                        ttype = "NiCO4"
-                        batch_id = f"B-{petri.next_batch_id()}"
-                        token = ColouredToken(ttype, batch_id=batch_id, mass=1.0, T=25.0, purity=None)
-                    elif "CO" in out_place_name.upper() or out_place_name.lower().startswith("p_co"):
-                        ttype = "CO"
-                        token = ColouredToken(ttype, batch_id=str(uuid.uuid4())[:8], mass=1.0)
-                    elif "Ni" in out_place_name and "pure" in out_place_name:
-                        ttype = "Ni_pure"
-                        token = ColouredToken(ttype, batch_id=str(uuid.uuid4())[:8], mass=1.0, purity=0.99)
-                    else:
-                        # generic material token
-                        token = ColouredToken("material", batch_id=str(uuid.uuid4())[:8], mass=1.0)
-                    produced.append(token)
+                # out_val is integer weight: produce default tokens through
+                # the factory resolved at bind time (transitions fired
+                # without ever being bound resolve it lazily once here)
+                factory = self._default_factories.get(out_place_name)
+                if factory is None:
+                    ttype, T, purity, id_style = _default_token_spec(out_place_name)
+                    id_fn = _batch_token_id if id_style == "batch" else _counter_token_id
+                    factory = _make_default_factory(ttype, T, purity, id_fn)
+                    self._default_factories[out_place_name] = factory
+                produced = [factory(petri) for _ in range(int(out_val))]
                 petri.places[out_place_name].add_tokens(produced)
+                for tok in produced:
+                    ColouredToken.release(tok)
+
+        # Views are dead once the outputs have run: places copied their
+        # fields out on add, so the objects can go back to the pool.
+        if views is not None:
+            for toks in views.values():
+                for tok in toks:
+                    ColouredToken.release(tok)
 
         self.fired_count += 1
         return True, selected
@@ -165,71 +536,202 @@ class Transition:
 # -------------------------
 
 class PetriNet:
-    def __init__(self):
+    # Default ordering for the 'prioritise' policy: carbonylation and
+    # decomposition first, then the transfers that feed them.
+    DEFAULT_PRIORITY = ("T6", "T10", "T11", "T8", "T7")
+
+    def __init__(self, priority_names=None):
         self.places = {}
         self.transitions = {}
+        self.priority_names = tuple(priority_names) if priority_names else self.DEFAULT_PRIORITY
         self.stats = defaultdict(int)
         self.global_time = 0.0
         self._batch_counter = 0
+        self._next_token_id = 0   # monotonic default-token id stream
+        # Integer-indexed mirror of the net: a live marking vector (kept in
+        # sync by the Place mutators) plus input/output incidence matrices
+        # built lazily once the structure stops changing. Enabledness then
+        # reduces to one vectorized compare instead of a Python loop over
+        # every transition's input places.
+        self._marking = np.zeros(0, dtype=np.int32)
+        self._cap_vec = np.zeros(0, dtype=np.int32)
+        self._transition_list = []
+        self._tid_by_name = {}
+        # Per-transition firing counters, indexed by tid; the fired::name
+        # strings are only formatted in summary_stats at shutdown.
+        self.stats_by_tid = np.zeros(0, dtype=np.int64)
+        self._W_in = None
+        self._W_out = None
+        self._priority_ids = None
 
     def add_place(self, place: Place):
         if place.name in self.places:
             raise ValueError("place exists")
+        place._pid = len(self.places)
+        place._net = self
         self.places[place.name] = place
+        marking = np.zeros(len(self.places), dtype=np.int32)
+        marking[:-1] = self._marking
+        marking[-1] = place.count()
+        self._marking = marking
+        cap_vec = np.zeros(len(self.places), dtype=np.int32)
+        cap_vec[:-1] = self._cap_vec
+        cap_vec[-1] = place.capacity
+        self._cap_vec = cap_vec
+        self._W_in = None  # structure changed; rebuild on next use
 
     def add_transition(self, transition: Transition):
         if transition.name in self.transitions:
             raise ValueError("transition exists")
         self.transitions[transition.name] = transition
+        self._tid_by_name[transition.name] = len(self._transition_list)
+        self._transition_list.append(transition)
+        self.stats_by_tid = np.append(self.stats_by_tid, 0)
+        transition.bind(self)
+        self._W_in = None
+
+    def _ensure_incidence(self):
+        if self._W_in is not None:
+            return
+        n_t = len(self._transition_list)
+        n_p = len(self.places)
+        W_in = np.zeros((n_t, n_p), dtype=np.int16)
+        W_out = np.zeros((n_t, n_p), dtype=np.int16)
+        for tid, tr in enumerate(self._transition_list):
+            for pname, w in tr.inputs.items():
+                W_in[tid, self.places[pname]._pid] = w
+            for pname, out_val in tr.outputs.items():
+                if not callable(out_val):
+                    W_out[tid, self.places[pname]._pid] = out_val
+            for pname, w in tr.count_effects.items():
+                W_out[tid, self.places[pname]._pid] = w
+        self._W_in = W_in
+        self._W_out = W_out
+        # Priority names resolved to transition ids once; the prioritise
+        # policy then scans the enabled mask by index with no string compares.
+        self._priority_ids = [self._tid_by_name[n] for n in self.priority_names
+                              if n in self._tid_by_name]
 
     def next_batch_id(self):
         self._batch_counter += 1
         return f"{self._batch_counter:04d}"
 
     def get_enabled_transitions(self):
-        return [t for t in self.transitions.values() if t.is_enabled(self)]
+        self._ensure_incidence()
+        mask = enabled_mask(self._W_in, self._W_out, self._marking, self._cap_vec)
+        return [self._transition_list[tid] for tid in np.flatnonzero(mask)]
 
     def step_fire(self, transition_name):
         tr = self.transitions[transition_name]
         ok, info = tr.fire(self)
         if ok:
-            self.stats[f"fired::{transition_name}"] += 1
+            self.stats_by_tid[self._tid_by_name[transition_name]] += 1
             return True, info
         else:
             return False, info
 
+    def fire_batch(self, transition_name, count):
+        """Fire one transition up to count times; returns the number fired.
+
+        Goes straight at the specialized closure when the transition has
+        one, skipping the per-call fire() dispatch and stats formatting.
+        """
+        tr = self.transitions[transition_name]
+        fired = 0
+        fast = tr._fire
+        if fast is not None:
+            while fired < count and fast(self):
+                fired += 1
+            tr.fired_count += fired
+        else:
+            while fired < count:
+                ok, _ = tr.fire(self)
+                if not ok:
+                    break
+                fired += 1
+        if fired:
+            self.stats_by_tid[self._tid_by_name[transition_name]] += fired
+        return fired
+
+    def summary_stats(self):
+        """Firing counts plus callable-recorded stats, with display keys."""
+        out = {f"fired::{self._transition_list[tid].name}": int(c)
+               for tid, c in enumerate(self.stats_by_tid) if c}
+        out.update(self.stats)
+        return out
+
+    def _concurrent_step(self):
+        """Fire a greedily-packed maximal set of enabled transitions at once.
+
+        A transition joins the step only if the tick-start marking still
+        covers its input weights after reserving tokens for the transitions
+        already accepted (sum of F(p,t) over the step <= M(p) per place),
+        so the whole set could have fired concurrently. Returns the
+        ids of the transitions that actually fired.
+        """
+        self._ensure_incidence()
+        W_in = self._W_in
+        work = self._marking.copy()
+        fired = []
+        for tid in np.flatnonzero(enabled_mask(W_in, self._W_out, work, self._cap_vec)):
+            trial = work - W_in[tid]
+            if trial.min() < 0:
+                continue
+            # Guards and callable outputs still go through the normal
+            # per-transition fire; only firings that happen reserve tokens.
+            ok, _ = self._transition_list[tid].fire(self)
+            if ok:
+                work = trial
+                fired.append(int(tid))
+        return fired
+
     def auto_run(self, steps=50, policy="random", verbose=False):
         """
         policy: 'random' -> pick random enabled transition
                 'prioritise' -> use rule-based priority (T6, T10 higher)
+                'concurrent' -> fire a maximal concurrent set per step
         """
+        # One vectorized draw covers every step's random pick: indexing a
+        # pre-drawn float scaled by the enabled count replaces a Python
+        # random-module call per iteration.
+        rand_stream = None
+        if policy != "concurrent":
+            rand_stream = np.random.default_rng().random(steps)
         for step in range(steps):
-            enabled = [t for t in self.transitions.values() if t.is_enabled(self)]
-            if not enabled:
+            if policy == "concurrent":
+                fired = self._concurrent_step()
+                if not fired:
+                    if verbose:
+                        print(f"[time {self.global_time}] No enabled transitions. Halting at step {step}.")
+                    break
+                self.stats_by_tid[fired] += 1
+                if verbose:
+                    names = ', '.join(self._transition_list[t].name for t in fired)
+                    print(f"[step {step}] Fired {names}.")
+                self.global_time += 1.0
+                continue
+            self._ensure_incidence()
+            mask = enabled_mask(self._W_in, self._W_out, self._marking, self._cap_vec)
+            enabled_ids = np.flatnonzero(mask)
+            if enabled_ids.size == 0:
                 if verbose:
                     print(f"[time {self.global_time}] No enabled transitions. Halting at step {step}.")
                 break
-            chosen = None
-            if policy == "random":
-                chosen = random.choice(enabled)
-            elif policy == "prioritise":
-                # prioritize carbonylation (T6) and decomposition (T10) if enabled
-                priority_names = ["T6", "T10", "T11", "T8", "T7"]
-                for pname in priority_names:
-                    for t in enabled:
-                        if t.name == pname:
-                            chosen = t
-                            break
-                    if chosen:
+            chosen_tid = -1
+            if policy == "prioritise":
+                # First enabled transition in precomputed priority order:
+                # plain mask indexing, no name scans.
+                for tid in self._priority_ids:
+                    if mask[tid]:
+                        chosen_tid = tid
                         break
-                if not chosen:
-                    chosen = random.choice(enabled)
-            else:
-                chosen = random.choice(enabled)
+            if chosen_tid < 0:  # 'random' policy, or no priority hit
+                chosen_tid = int(enabled_ids[int(rand_stream[step] * enabled_ids.size)])
+            chosen = self._transition_list[chosen_tid]
 
             ok, info = chosen.fire(self)
             if ok:
-                self.stats[f"fired::{chosen.name}"] += 1
+                self.stats_by_tid[chosen_tid] += 1
                 if verbose:
                     print(f"[step {step}] Fired {chosen.name}.")
             else:
@@ -245,9 +747,7 @@ class PetriNet:
     def print_status(self):
         print("=== Petri Net Status (grouped) ===")
         for name, place in self.places.items():
-            counts = defaultdict(int)
-            for token in place.tokens:
-                counts[token.type] += 1
+            counts = place.type_counts()
             summary = ", ".join(f"{t}:{c}" for t, c in counts.items())
             print(f"{name:<20}: {summary}")
 
@@ -273,15 +773,14 @@ def build_mond_process():
         else:
             net.add_place(Place(name))
 
-    # initial marking
-    # Add Ni ore tokens to P_feed_ore
-    for i in range(10):
-        t = ColouredToken("Ni_ore", batch_id=f"ORE{i+1:03d}", mass=1.0, purity=0.6)
-        net.places["P_feed_ore"].add_tokens(t)
-
-    # Add CO feed tokens to P_CO_feed
-    for i in range(40):
-        net.places["P_CO_feed"].add_tokens(ColouredToken("CO", batch_id=f"CO{i+1:03d}", mass=1.0))
+    # initial marking, added as one batch per place so the token store
+    # sizes its columns once instead of growing across 50 single adds
+    net.places["P_feed_ore"].add_tokens(
+        [ColouredToken("Ni_ore", batch_id=f"ORE{i+1:03d}", mass=1.0, purity=0.6)
+         for i in range(10)])
+    net.places["P_CO_feed"].add_tokens(
+        [ColouredToken("CO", batch_id=f"CO{i+1:03d}", mass=1.0)
+         for i in range(40)])
 
     # Define guard helper functions where needed
 
@@ -312,7 +811,7 @@ def build_mond_process():
         inp = selected["P_impure_Ni"][0]
         batch_id = f"NC-{petri.next_batch_id()}"
         # NiCO4 inherits approximate mass from input and new temperature
-        tok = ColouredToken("NiCO4", batch_id=batch_id, mass=inp.mass, T=25.0, purity=None)
+        tok = ColouredToken.acquire("NiCO4", batch_id=batch_id, mass=inp.mass, T=25.0)
         return tok
 
     def decompose_NiCO4_outputs(selected, petri):
@@ -350,7 +849,8 @@ def build_mond_process():
         inputs={"P_impure_Ni": 1, "P_CO_feed": 4},
         outputs={"P_NiCO4_gas": create_NiCO4},
         guard=guard_T6,
-        description="Carbonylation: Ni + CO -> Ni(CO)4"
+        description="Carbonylation: Ni + CO -> Ni(CO)4",
+        count_effects={"P_NiCO4_gas": 1}
     )
     # T7 - Transfer to condenser: NiCO4_gas -> condenser
     T7 = Transition("T7", inputs={"P_NiCO4_gas": 1}, outputs={"P_condenser": 1}, description="Transfer to condenser.")
@@ -364,33 +864,46 @@ def build_mond_process():
         # selected has P_decomposer: [NiCO4 token]
         inp = selected["P_decomposer"][0]
         # produce pure Ni
-        ni_pure = ColouredToken("Ni_pure", batch_id=f"NP-{petri.next_batch_id()}", mass=inp.mass, purity=0.99, T=25.0)
+        ni_pure = ColouredToken.acquire("Ni_pure", batch_id=f"NP-{petri.next_batch_id()}", mass=inp.mass, purity=0.99, T=25.0)
         # produce 4 CO tokens to go to P_CO_recycle
-        co_out = [ColouredToken("CO", batch_id=f"RCO-{petri.next_batch_id()}", mass=1.0) for _ in range(4)]
+        co_out = [ColouredToken.acquire("CO", batch_id=f"RCO-{petri.next_batch_id()}") for _ in range(4)]
         # Place Ni_pure into P_pure_Ni and CO tokens into P_CO_recycle
         # Transition outputs mapping functions must return single token or list; we return list for each place
         petri.places["P_pure_Ni"].add_tokens(ni_pure)
         petri.places["P_CO_recycle"].add_tokens(co_out)
+        # Adding to a place copies the fields out, so these go straight
+        # back to the pool (this callable returns None, so fire can't
+        # release them for us).
+        ColouredToken.release(ni_pure)
+        for tok in co_out:
+            ColouredToken.release(tok)
         return None  # we've already handled adding to places
-    T10 = Transition("T10", inputs={"P_decomposer": 1}, outputs={"P_pure_Ni": T10_output_callable}, guard=guard_T10, description="Decomposition: NiCO4 -> Ni + CO")
+    T10 = Transition("T10", inputs={"P_decomposer": 1}, outputs={"P_pure_Ni": T10_output_callable}, guard=guard_T10, description="Decomposition: NiCO4 -> Ni + CO",
+                     count_effects={"P_pure_Ni": 1, "P_CO_recycle": 4})
     # T11 - CO recycle to feed: P_CO_recycle -> P_CO_feed
     T11 = Transition("T11", inputs={"P_CO_recycle": 1}, outputs={"P_CO_feed": 1}, description="CO recycle to feed.")
     # T12 - Quality check: P_pure_Ni -> P_storage (pass) OR P_scrubber (fail)
     # We'll implement two transitions: T12_pass and T12_fail for deterministic firing; but here we implement T12 as a probabilistic router.
     def T12_callable(selected, petri):
+        # the selected token is a detached view of a row fire has already
+        # removed from P_pure_Ni, so it can be rerouted as-is - no
+        # defensive copy needed
         tok = selected["P_pure_Ni"][0]
         # simulate QC: pass with prob based on purity (cap between 0 and 1)
         pass_prob = tok.purity if tok.purity is not None else 0.95
         if random.random() <= pass_prob:
-            petri.places["P_storage"].add_tokens(tok.copy())
+            petri.places["P_storage"].add_tokens(tok)
             # increase stat
             petri.stats["qc_passed"] += 1
         else:
-            petri.places["P_scrubber"].add_tokens(tok.copy())
+            petri.places["P_scrubber"].add_tokens(tok)
             petri.stats["qc_failed"] += 1
         # No need to return because we've added to places. The consumed token is already removed by transition.fire
         return None
-    T12 = Transition("T12", inputs={"P_pure_Ni": 1}, outputs={"P_storage": T12_callable}, description="Quality check (probabilistic).")
+    # count_effects models the QC pass branch; marking-level reasoning
+    # treats the probabilistic router as routing to storage.
+    T12 = Transition("T12", inputs={"P_pure_Ni": 1}, outputs={"P_storage": T12_callable}, description="Quality check (probabilistic).",
+                     count_effects={"P_storage": 1})
 
     # T13 - Scrap / Waste handling: P_scrubber -> P_offgas
     T13 = Transition("T13", inputs={"P_scrubber": 1}, outputs={"P_offgas": 1}, description="Scrap/waste handling.")
@@ -405,33 +918,57 @@ def build_mond_process():
     return net
 
 # -------------------------
-# BFS sequence finder (simple)
+# Iterative-deepening sequence finder
 # -------------------------
-def find_sequence_bfs(net: PetriNet, goal_check_fn, max_depth=8):
+def find_sequence_ids(net: PetriNet, goal_check_fn, max_depth=8):
     """
-    Try to find a firing sequence of transitions (by name) up to max_depth that reaches a state satisfying goal_check_fn(snapshot).
-    This is an exponential search in worst case; used for small toy examples.
+    Iterative-deepening search for a firing sequence (transition names) of
+    length <= max_depth reaching a marking satisfying
+    goal_check_fn(marking, place_ids), where place_ids maps place name ->
+    index into the marking vector.
+
+    Depth-first with in-place fire/unfire keeps the working set at
+    O(depth) - one marking vector and the current path - where a BFS
+    frontier holds every expanded state. Within each deepening pass,
+    visited maps packed markings to the largest remaining budget they were
+    explored with, pruning revisits that cannot reach anything new.
+    Count-level reachability only: guards are ignored and callable outputs
+    contribute their declared count_effects.
     """
-    initial_snapshot = deepcopy(net)
-    queue = deque()
-    queue.append((initial_snapshot, []))  # (net_copy, sequence)
-    visited = 0
-    while queue:
-        current_net, seq = queue.popleft()
-        visited += 1
-        if goal_check_fn(current_net.status_snapshot()):
-            return seq
-        if len(seq) >= max_depth:
-            continue
-        # get enabled transitions in current_net
-        enabled = [t for t in current_net.transitions.values() if t.is_enabled(current_net)]
-        for t in enabled:
-            # simulate firing on a deep copy
-            net_copy = deepcopy(current_net)
-            ok, info = net_copy.transitions[t.name].fire(net_copy)
-            # if fired (should be), push new state
-            if ok:
-                queue.append((net_copy, seq + [t.name]))
+    net._ensure_incidence()
+    W_in, W_out = net._W_in, net._W_out
+    cap_vec = net._cap_vec
+    place_ids = {name: place._pid for name, place in net.places.items()}
+    names = [t.name for t in net._transition_list]
+    n_t = len(names)
+    marking = net._marking.copy()
+    path = []
+
+    def _dfs(budget, visited):
+        if goal_check_fn(marking, place_ids):
+            return True
+        if budget == 0:
+            return False
+        mask = enabled_mask(W_in, W_out, marking, cap_vec)
+        for tid in range(n_t):
+            if not mask[tid]:
+                continue
+            fire_inplace(W_in, W_out, marking, tid)
+            key = marking.tobytes()
+            child_budget = budget - 1
+            if visited.get(key, -1) < child_budget:
+                visited[key] = child_budget
+                path.append(names[tid])
+                if _dfs(child_budget, visited):
+                    return True
+                path.pop()
+            # unfire: arguments swapped, so marking += W_in - W_out
+            fire_inplace(W_out, W_in, marking, tid)
+        return False
+
+    for depth in range(max_depth + 1):
+        if _dfs(depth, {marking.tobytes(): depth}):
+            return list(path)
     return None
 
 # -------------------------
@@ -452,28 +989,38 @@ def main():
     print("\nAfter auto-run status:")
     net.print_status()
 
-    # Run QC on any P_pure_Ni tokens by firing T12 repeatedly
-    while net.places["P_pure_Ni"].count() > 0:
-        ok, info = net.step_fire("T12")
-        if not ok:
-            # if guard blocked for some reason, break
-            break
+    # Run QC on all P_pure_Ni tokens at once: one vectorized random draw
+    # against the purity column, then two bulk subset moves. Equivalent to
+    # firing T12 per token, minus n Python dispatches and token copies.
+    pure = net.places["P_pure_Ni"]
+    n = pure.count()
+    if n:
+        purity = pure.store.purity[:n]
+        passed = np.random.random(n) <= np.nan_to_num(purity, nan=0.95)
+        n_passed = int(passed.sum())
+        pure.move_subset(net.places["P_storage"], passed)
+        # the survivors are exactly the failures (rows renumber after a move)
+        pure.move_subset(net.places["P_scrubber"], np.ones(pure.count(), dtype=bool))
+        net.stats["qc_passed"] += n_passed
+        net.stats["qc_failed"] += n - n_passed
+        net.transitions["T12"].fired_count += n
+        net.stats_by_tid[net._tid_by_name["T12"]] += n
 
     print("After QC routing:")
     net.print_status()
 
     # Print summary stats
     print("=== Summary stats ===")
-    for k, v in net.stats.items():
+    for k, v in net.summary_stats().items():
         print(f"{k}: {v}")
     print("=====================")
 
-    # Example BFS goal: find sequence to produce at least one token in P_storage starting from initial small net
-    # Use a small shallow net to test BFS. (Be careful: BFS with our full net can blow up.)
-    print("\nAttempting small BFS from current net snapshot to find a sequence that yields P_storage >=1 ... (max depth 6)")
-    def goal_fn(snapshot):
-        return snapshot.get("P_storage", 0) >= 1
-    seq = find_sequence_bfs(net, goal_fn, max_depth=6)
+    # Example search goal: find sequence to produce at least one token in P_storage
+    # Iterative deepening keeps memory at O(depth) even on the full net.
+    print("\nAttempting small search from current net snapshot to find a sequence that yields P_storage >=1 ... (max depth 6)")
+    def goal_fn(marking, place_ids):
+        return marking[place_ids["P_storage"]] >= 1
+    seq = find_sequence_ids(net, goal_fn, max_depth=6)
     if seq:
         print("Found sequence:", seq)
     else:
@@ -0,0 +1,26 @@
+# token_pool.py
+"""
+Free-list recycling for token records.
+
+The SoA token stores never retain ColouredToken objects: views and
+default tokens exist only for the duration of one firing before their
+fields are copied into place columns. Instead of round-tripping the
+CPython allocator (and GC tracking) for every one of them, released
+instances park here and are re-initialized with plain slot writes on the
+next acquire.
+"""
+
+MAX_POOL = 4096
+
+_FREE = []
+
+
+def take():
+    """Pop a recycled instance, or None when the pool is empty."""
+    return _FREE.pop() if _FREE else None
+
+
+def give(tok):
+    """Return an instance to the pool (dropped once the pool is full)."""
+    if len(_FREE) < MAX_POOL:
+        _FREE.append(tok)